@@ -8,14 +8,19 @@ and orchestrates the conversion process, streaming progress updates to the front
 import os
 import time
 import webbrowser
-from threading import Timer
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread, Timer
 
 from flask import Flask, render_template, request, Response, stream_with_context
 from dotenv import load_dotenv
 import googleapiclient.errors # Import specifically for HttpError handling
 
 from src.spotify_client import SpotifyClient
-from src.youtube_client import YouTubeClient, TOKEN_FILE as YT_TOKEN_FILE
+from src.youtube_client import (YouTubeClient, TOKEN_FILE as YT_TOKEN_FILE, BATCH_ADD_SIZE,
+                                http_error_body, is_quota_exceeded_error)
+from src.search_cache import SearchCache, search_cache
 from src.utils import sanitize_filename, extract_playlist_id_from_url
 from src.logger_config import app_logger as logger
 
@@ -26,13 +31,154 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.urandom(24) # Secret key for session management
 
-# Global client handlers, initialized once per process
+# Global client handlers, initialized once per process and reused by every
+# request afterwards. Guarded by _clients_lock so concurrent first requests
+# cannot race the (slow) initialization.
 spotify_handler = None
 youtube_handler = None
+_clients_lock = Lock()
 
 # Flag to ensure browser is opened only once per application run
 _browser_opened_this_run = False
 
+# Maximum number of concurrent YouTube search requests in flight at once.
+# Searches are I/O-bound (network latency), so a small worker pool collapses
+# the per-track round-trips without hammering the API quota.
+MAX_CONCURRENT_SEARCHES = 4
+
+# Keywords to use for YouTube search, ordered by preference. Immutable and
+# hoisted to module scope so the conversion loop never rebuilds it.
+SEARCH_KEYWORDS = ("official video", "official music video", "official audio", "lyrics", "audio", "")
+
+# Constant SSE frames, built and UTF-8 encoded once at import time so the hot
+# yield path never re-constructs or re-encodes them.
+SSE_END_OF_STREAM = b"data: END_OF_STREAM\n\n"
+SSE_PROCESS_COMPLETE = b"\n\ndata: --- Process Complete ---\n\n"
+
+# Cached result of the YouTube token-file existence check. The frontend polls
+# /check_auth, so stat-ing the file on every poll is a syscall per request for
+# a value that changes only when the OAuth flow completes.
+_yt_auth_cache = {"authorized": None, "checked_at": 0.0}
+_YT_AUTH_CACHE_TTL = 1.0 # Seconds before re-stating the token file
+
+def is_youtube_authorized() -> bool:
+    """
+    Returns whether a YouTube token file exists, stat-ing it at most once per
+    _YT_AUTH_CACHE_TTL seconds. initialize_clients() flips the cached value
+    directly when authentication succeeds, so the UI updates immediately.
+    """
+    now = time.monotonic()
+    if _yt_auth_cache["authorized"] is None or now - _yt_auth_cache["checked_at"] >= _YT_AUTH_CACHE_TTL:
+        _yt_auth_cache["authorized"] = os.path.exists(YT_TOKEN_FILE)
+        _yt_auth_cache["checked_at"] = now
+    return _yt_auth_cache["authorized"]
+
+def sse_message(message: str) -> bytes:
+    """
+    Formats a message as a UTF-8 encoded SSE data frame.
+
+    Flask streams bytes through unchanged, so encoding here (once) avoids the
+    per-chunk str-to-bytes conversion Werkzeug would otherwise perform.
+    """
+    return f"data: {message}\n\n".encode("utf-8")
+
+# Maximum SSE frames buffered per connection before the producer stalls.
+# Bounds worst-case memory when a slow browser drains frames more slowly
+# than the conversion produces them.
+SSE_QUEUE_MAX_FRAMES = 64
+_SSE_QUEUE_SENTINEL = object() # Signals end of production to the consumer
+
+def stream_with_backpressure(frame_generator):
+    """
+    Runs an SSE frame generator in a worker thread feeding a bounded queue,
+    and yields frames from that queue.
+
+    When the client drains slowly, the queue fills and the producer blocks,
+    naturally rate-matching the conversion to the connection instead of
+    buffering unbounded bytes in process memory. A client disconnect sets the
+    abort flag so the producer thread winds down instead of leaking.
+
+    Args:
+        frame_generator: A generator yielding SSE frames as bytes.
+
+    Yields:
+        bytes: SSE frames, in production order.
+    """
+    frame_queue = Queue(maxsize=SSE_QUEUE_MAX_FRAMES)
+    client_gone = Event()
+
+    def produce():
+        try:
+            for frame in frame_generator:
+                # Re-check the abort flag each second so a vanished client
+                # cannot leave this thread blocked on a full queue forever.
+                while not client_gone.is_set():
+                    try:
+                        frame_queue.put(frame, timeout=1.0)
+                        break
+                    except Full:
+                        continue
+                if client_gone.is_set():
+                    logger.info("SSE client disconnected; abandoning conversion stream production.")
+                    frame_generator.close()
+                    return
+        except Exception as e:
+            logger.exception("Unexpected error inside SSE producer thread: %s", e)
+            try:
+                frame_queue.put(sse_message(f"FATAL Error during conversion: {e}"), timeout=1.0)
+                frame_queue.put(SSE_END_OF_STREAM, timeout=1.0)
+            except Full:
+                pass
+        finally:
+            try:
+                frame_queue.put(_SSE_QUEUE_SENTINEL, timeout=1.0)
+            except Full:
+                pass
+
+    producer = Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            try:
+                frame = frame_queue.get(timeout=1.0)
+            except Empty:
+                # The sentinel put is best-effort (it times out against a
+                # full queue), so do not rely on it always landing: a dead
+                # producer with a drained queue means no more frames are
+                # coming and blocking further would hang the worker thread.
+                if not producer.is_alive():
+                    break
+                continue
+            if frame is _SSE_QUEUE_SENTINEL:
+                break
+            yield frame
+    finally:
+        client_gone.set() # Reached on normal completion and on client disconnect
+
+def gzip_sse_stream(frame_generator):
+    """
+    Compresses an SSE byte stream with gzip, sync-flushing after every frame.
+
+    SSE text compresses roughly 5-8x, but a naive gzip wrapper would buffer
+    events inside the compressor and break live streaming; flushing with
+    Z_SYNC_FLUSH after each frame emits it immediately while keeping the
+    cross-frame compression dictionary.
+
+    Args:
+        frame_generator: A generator yielding SSE frames as bytes.
+
+    Yields:
+        bytes: gzip-compressed chunks, one per input frame.
+    """
+    compressor = zlib.compressobj(wbits=31) # wbits=31 selects the gzip container
+    for frame in frame_generator:
+        chunk = compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if chunk:
+            yield chunk
+    tail = compressor.flush(zlib.Z_FINISH)
+    if tail:
+        yield tail
+
 def initialize_clients():
     """
     Initializes or re-initializes Spotify and YouTube API clients.
@@ -46,39 +192,53 @@ def initialize_clients():
         Exception: For any other unexpected errors during initialization.
     """
     global spotify_handler, youtube_handler
-    try:
-        # Initialize Spotify client if not already initialized
-        if not spotify_handler:
-            spotify_handler = SpotifyClient()
-            if not spotify_handler.sp:
-                logger.error("Spotify client failed to initialize properly. Check .env and Spotify API status.")
-                # Allow to continue; the generate_conversion_stream will handle this gracefully
-        
-        # Initialize/re-initialize YouTube client if not available or not authenticated
-        if not youtube_handler or not youtube_handler.youtube:
-            youtube_handler = YouTubeClient() # This might create a new instance and re-trigger auth
-            
-            # Validate YouTube client secrets file path
-            if not youtube_handler.client_secrets_file or not os.path.exists(youtube_handler.client_secrets_file):
-                logger.error("YouTube client_secret.json path not configured in .env or file missing. YouTube features will fail.")
-                raise FileNotFoundError("YouTube client_secret.json path not configured or file missing. Check YOUTUBE_CLIENT_SECRETS_FILE in .env and the 'credentials' directory.")
-
-            # Attempt to get an authenticated YouTube service (triggers OAuth if needed)
-            if not youtube_handler._get_authenticated_service():
-                logger.error("Failed to build and authenticate YouTube service. OAuth flow might not have completed or other issues occurred.")
-                raise ConnectionError("Failed to initialize and authenticate YouTube service. Check terminal for OAuth prompts or error messages regarding 'client_secret.json' or API access.")
-
-        logger.info("Spotify and YouTube clients initialized/re-initialized successfully.")
+
+    # Fast path: both singletons are already live, skip the lock entirely.
+    # This is what every request after the first hits.
+    if spotify_handler and spotify_handler.sp and youtube_handler and youtube_handler.youtube:
         return True
-    except (ValueError, FileNotFoundError) as e:
-        logger.error(f"Configuration error during client initialization: {e}")
-        raise
-    except ConnectionError as e:
-        logger.error(f"Connection/Auth error during YouTube client initialization: {e}")
-        raise
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred during client initialization: {e}")
-        raise
+
+    with _clients_lock:
+        try:
+            # Initialize Spotify client if not already initialized
+            if not spotify_handler:
+                spotify_handler = SpotifyClient()
+                if not spotify_handler.sp:
+                    logger.error("Spotify client failed to initialize properly. Check .env and Spotify API status.")
+                    # Allow to continue; the generate_conversion_stream will handle this gracefully
+
+            # Lazily authenticate the YouTube client; the instance itself is
+            # created once and reused, only the auth handshake is repeated when
+            # the previous one did not complete.
+            if not youtube_handler or not youtube_handler.youtube:
+                if not youtube_handler:
+                    youtube_handler = YouTubeClient()
+
+                # Validate YouTube client secrets file path
+                if not youtube_handler.client_secrets_file or not os.path.exists(youtube_handler.client_secrets_file):
+                    logger.error("YouTube client_secret.json path not configured in .env or file missing. YouTube features will fail.")
+                    raise FileNotFoundError("YouTube client_secret.json path not configured or file missing. Check YOUTUBE_CLIENT_SECRETS_FILE in .env and the 'credentials' directory.")
+
+                # Attempt to get an authenticated YouTube service (triggers OAuth if needed)
+                if not youtube_handler._get_authenticated_service():
+                    logger.error("Failed to build and authenticate YouTube service. OAuth flow might not have completed or other issues occurred.")
+                    raise ConnectionError("Failed to initialize and authenticate YouTube service. Check terminal for OAuth prompts or error messages regarding 'client_secret.json' or API access.")
+
+            logger.info("Spotify and YouTube clients initialized/re-initialized successfully.")
+            # Auth just succeeded (token file written); update the cached
+            # check so /check_auth reflects it without waiting for the TTL.
+            _yt_auth_cache["authorized"] = True
+            _yt_auth_cache["checked_at"] = time.monotonic()
+            return True
+        except (ValueError, FileNotFoundError) as e:
+            logger.error("Configuration error during client initialization: %s", e)
+            raise
+        except ConnectionError as e:
+            logger.error("Connection/Auth error during YouTube client initialization: %s", e)
+            raise
+        except Exception as e:
+            logger.exception("An unexpected error occurred during client initialization: %s", e)
+            raise
 
 @app.route('/')
 def index():
@@ -88,7 +248,7 @@ def index():
     Checks if YouTube is authorized (i.e., if a token.json file exists)
     to display appropriate UI elements.
     """
-    yt_authorized = os.path.exists(YT_TOKEN_FILE)
+    yt_authorized = is_youtube_authorized()
     return render_template('index.html', yt_authorized=yt_authorized)
 
 def generate_conversion_stream(spotify_playlist_url: str, youtube_playlist_name: str, yt_privacy_status: str):
@@ -102,161 +262,331 @@ def generate_conversion_stream(spotify_playlist_url: str, youtube_playlist_name:
         yt_privacy_status (str): The privacy status for the YouTube playlist ("public", "private", "unlisted").
 
     Yields:
-        str: Formatted strings ("data: MESSAGE\n\n") representing conversion progress or errors.
-             Ends with "data: END_OF_STREAM\n\n".
+        bytes: UTF-8 encoded SSE frames (b"data: MESSAGE\n\n") representing conversion
+               progress or errors. Ends with b"data: END_OF_STREAM\n\n".
     """
     try:
         # Initialize API clients; if this fails, yield error and stop
         if not initialize_clients():
-            yield "data: Error: Could not initialize API clients. Please check your .env configuration, 'credentials/client_secret.json', and ensure you have completed the YouTube OAuth flow if prompted. Check logs (logs/converter.log and terminal) for more details.\n\n"
-            yield "data: END_OF_STREAM\n\n"
+            yield sse_message("Error: Could not initialize API clients. Please check your .env configuration, 'credentials/client_secret.json', and ensure you have completed the YouTube OAuth flow if prompted. Check logs (logs/converter.log and terminal) for more details.")
+            yield SSE_END_OF_STREAM
             return
     except Exception as e:
-        logger.error(f"Fatal error during client initialization in generate_conversion_stream: {e}")
-        yield f"data: FATAL Error during client initialization: {str(e)}. Please check server logs and configuration.\n\n"
-        yield "data: END_OF_STREAM\n\n"
+        logger.error("Fatal error during client initialization in generate_conversion_stream: %s", e)
+        yield sse_message(f"FATAL Error during client initialization: {str(e)}. Please check server logs and configuration.")
+        yield SSE_END_OF_STREAM
         return
 
     # Check if clients are available after initialization attempt
     if not spotify_handler or not spotify_handler.sp:
-        yield "data: Error: Spotify client is not available. Check .env configuration and logs.\n\n"
-        yield "data: END_OF_STREAM\n\n"
+        yield sse_message("Error: Spotify client is not available. Check .env configuration and logs.")
+        yield SSE_END_OF_STREAM
         return
     if not youtube_handler or not youtube_handler.youtube:
-        yield "data: Error: YouTube client is not available or not authenticated. This usually means the YouTube authorization (OAuth) process was not completed successfully (e.g., token.json missing or invalid, or client_secret.json issue). Try again, ensure you allow permissions in the browser pop-up if prompted, and check server logs.\n\n"
-        yield "data: END_OF_STREAM\n\n"
+        yield sse_message("Error: YouTube client is not available or not authenticated. This usually means the YouTube authorization (OAuth) process was not completed successfully (e.g., token.json missing or invalid, or client_secret.json issue). Try again, ensure you allow permissions in the browser pop-up if prompted, and check server logs.")
+        yield SSE_END_OF_STREAM
         return
 
-    yield "data: Fetching tracks from Spotify playlist...\n\n"
-    logger.info(f"Attempting to fetch tracks for URL: {spotify_playlist_url}")
-    spotify_tracks = spotify_handler.get_playlist_tracks(spotify_playlist_url)
+    # Probe the quota with a 1-unit call before spending 100 units per search;
+    # an exhausted daily quota is detected up front instead of mid-playlist.
+    if not youtube_handler.probe_quota():
+        yield sse_message("FATAL ERROR: Your YouTube API quota is currently exhausted. The conversion cannot start. Please try again after your quota resets (usually daily, midnight PST), or request a quota increase from Google Cloud Console.")
+        logger.error("Aborting conversion before start: quota probe reported the YouTube API quota is exhausted.")
+        yield SSE_END_OF_STREAM
+        return
+
+    yield sse_message("Fetching tracks from Spotify playlist...")
+    logger.info("Attempting to fetch tracks for URL: %s", spotify_playlist_url)
+
+    # When no YouTube playlist name was provided, the playlist-details lookup
+    # (used only to derive a default name) is independent of the track fetch,
+    # so issue both Spotify requests concurrently instead of paying a serial
+    # round-trip after the tracks arrive.
+    playlist_id_for_name = extract_playlist_id_from_url(spotify_playlist_url)
+    playlist_details = None
+    if not youtube_playlist_name and playlist_id_for_name:
+        with ThreadPoolExecutor(max_workers=2) as prefetch_executor:
+            tracks_future = prefetch_executor.submit(spotify_handler.get_playlist_tracks, spotify_playlist_url)
+            details_future = prefetch_executor.submit(spotify_handler.get_playlist_details, playlist_id_for_name)
+            spotify_tracks = tracks_future.result()
+            playlist_details = details_future.result()
+    else:
+        spotify_tracks = spotify_handler.get_playlist_tracks(spotify_playlist_url)
 
     if not spotify_tracks:
-        yield f"data: No valid tracks (songs) found in Spotify playlist or an error occurred. URL: {spotify_playlist_url}. This could also mean the playlist is empty, private, or contains only podcasts/local files.\n\n"
-        logger.warning(f"No tracks found for Spotify URL: {spotify_playlist_url}")
-        yield "data: END_OF_STREAM\n\n"
+        yield sse_message(f"No valid tracks (songs) found in Spotify playlist or an error occurred. URL: {spotify_playlist_url}. This could also mean the playlist is empty, private, or contains only podcasts/local files.")
+        logger.warning("No tracks found for Spotify URL: %s", spotify_playlist_url)
+        yield SSE_END_OF_STREAM
         return
     
-    yield f"data: Found {len(spotify_tracks)} tracks in the Spotify playlist.\n\n"
+    yield sse_message(f"Found {len(spotify_tracks)} tracks in the Spotify playlist.")
 
     # Determine the final YouTube playlist name
     final_youtube_playlist_name = youtube_playlist_name
     if not final_youtube_playlist_name:
-        # If no name provided, try to derive from Spotify playlist details
-        playlist_id_for_name = extract_playlist_id_from_url(spotify_playlist_url)
+        # If no name provided, derive from the prefetched Spotify playlist details
         suggested_name = "My Spotify Playlist on YouTube" # Default fallback name
         if playlist_id_for_name:
-            playlist_details = spotify_handler.get_playlist_details(playlist_id_for_name)
             if playlist_details and playlist_details.get('name'):
                 suggested_name = sanitize_filename(f"{playlist_details['name']} (on YouTube)")
             elif spotify_tracks: # Fallback to first track name if playlist details unavailable
                 suggested_name = sanitize_filename(f"{spotify_tracks[0][0]} and others (on YouTube)")
         final_youtube_playlist_name = suggested_name
-        yield f"data: Using default YouTube playlist name: '{final_youtube_playlist_name}'\n\n"
+        yield sse_message(f"Using default YouTube playlist name: '{final_youtube_playlist_name}'")
 
     youtube_playlist_desc = f"Playlist created from Spotify playlist: {spotify_playlist_url} by SpotifyToYouTubeConverter."
     
-    yield f"data: Creating YouTube playlist: '{final_youtube_playlist_name}' (Privacy: {yt_privacy_status})...\n\n"
-    youtube_playlist_id = youtube_handler.create_playlist(final_youtube_playlist_name, youtube_playlist_desc, yt_privacy_status)
+    # Reuse an existing playlist with the same name rather than creating a
+    # duplicate, making re-runs of the same conversion idempotent. The client
+    # retries transient errors internally and re-raises them once exhausted,
+    # so an HttpError here means the API stayed unreachable.
+    youtube_playlist_id = None
+    try:
+        youtube_playlist_id = youtube_handler.find_playlist_by_title(final_youtube_playlist_name)
+    except googleapiclient.errors.HttpError as e:
+        logger.error("Playlist lookup for '%s' failed after retries: %s", final_youtube_playlist_name, http_error_body(e))
+    if youtube_playlist_id:
+        yield sse_message(f"Found existing YouTube playlist '{final_youtube_playlist_name}'. Reusing it instead of creating a duplicate.")
+    else:
+        yield sse_message(f"Creating YouTube playlist: '{final_youtube_playlist_name}' (Privacy: {yt_privacy_status})...")
+        try:
+            youtube_playlist_id = youtube_handler.create_playlist(final_youtube_playlist_name, youtube_playlist_desc, yt_privacy_status)
+        except googleapiclient.errors.HttpError as e:
+            logger.error("Playlist creation for '%s' failed after retries: %s", final_youtube_playlist_name, http_error_body(e))
 
     if not youtube_playlist_id:
-        yield f"data: Error: Failed to create YouTube playlist '{final_youtube_playlist_name}'. Check logs for API errors (e.g., quota issues, invalid characters in name not caught by sanitization, or auth problems).\n\n"
-        logger.error(f"Failed to create YouTube playlist: {final_youtube_playlist_name}")
-        yield "data: END_OF_STREAM\n\n"
+        yield sse_message(f"Error: Failed to create YouTube playlist '{final_youtube_playlist_name}'. Check logs for API errors (e.g., quota issues, invalid characters in name not caught by sanitization, or auth problems).")
+        logger.error("Failed to create YouTube playlist: %s", final_youtube_playlist_name)
+        yield SSE_END_OF_STREAM
         return
 
-    yield f"data: YouTube playlist created! ID: {youtube_playlist_id}\n\n"
-    yield f"data: Link: https://www.youtube.com/playlist?list={youtube_playlist_id}\n\n"
+    yield sse_message(f"YouTube playlist created! ID: {youtube_playlist_id}")
+    yield sse_message(f"Link: https://www.youtube.com/playlist?list={youtube_playlist_id}")
 
     added_count = 0
     not_found_count = 0
     failed_to_add_count = 0
-    # Keywords to use for YouTube search, ordered by preference
-    search_keywords = ["official video", "official music video", "official audio", "lyrics", "audio", ""]
 
-    # Iterate through each Spotify track and search/add to YouTube
-    for i, (track_name, artist_name) in enumerate(spotify_tracks):
+    # Pre-bind hot loop values as locals: LOAD_FAST beats repeated
+    # LOAD_GLOBAL/LOAD_ATTR lookups on every iteration.
+    total_tracks = len(spotify_tracks)
+    yt = youtube_handler
+
+    def search_track(track_name: str, artist_name: str):
+        """
+        Worker function executed in the search pool. Returns a list of video IDs,
+        an empty list when the search completed and found nothing, or None when
+        the search errored without an answer; raises on quota errors so the
+        consumer can classify them.
+
+        Consults the persistent search cache first — a hit skips the 100-unit
+        search.list call entirely — and stores the first video ID on a miss.
+        """
+        cache_key = SearchCache.make_key(track_name, artist_name)
+        cached_video_id = search_cache.get(cache_key)
+        if cached_video_id:
+            logger.info("Search cache hit for '%s - %s': %s", track_name, artist_name, cached_video_id)
+            return [cached_video_id]
+        if search_cache.is_known_miss(cache_key):
+            logger.info("Skipping search for '%s - %s': recent search found nothing.", track_name, artist_name)
+            return []
+
         base_query = f"{track_name} {artist_name}"
-        yield f"data: [{i+1}/{len(spotify_tracks)}] Searching for: '{track_name} - {artist_name}'...\n\n"
-        logger.info(f"Searching for '{base_query}' on YouTube.")
-        
-        video_ids = []
+        logger.info("Searching for '%s' on YouTube.", base_query)
+        video_ids = yt.search_video_with_keywords(base_query, SEARCH_KEYWORDS, max_results=1)
+        if video_ids:
+            search_cache.put(cache_key, video_ids[0])
+        elif video_ids is not None:
+            # Only a search that completed empty is a confirmed miss; None
+            # means the attempts errored out, and recording that would
+            # suppress re-searching a findable track for the whole miss TTL.
+            search_cache.mark_miss(cache_key)
+        return video_ids
+
+    # Videos found by the searches are buffered here and flushed through the
+    # YouTube batch HTTP endpoint, which packs up to BATCH_ADD_SIZE
+    # playlistItems.insert sub-requests into a single HTTPS round-trip.
+    pending_adds = [] # List of (track_name, artist_name, video_id), in playlist order
+    abort_conversion = False
+
+    def flush_pending_adds():
+        """
+        Flushes the buffered videos to the playlist via one batch request,
+        yielding an SSE line per video and updating the summary counters.
+        Sets abort_conversion if the API quota is exhausted mid-batch.
+        """
+        nonlocal added_count, failed_to_add_count, abort_conversion
+        if not pending_adds:
+            return
+        yield sse_message(f"Adding batch of {len(pending_adds)} found videos to the playlist...")
+
+        # One cheap videos.list call (1 quota unit per 50 IDs) weeds out
+        # deleted/private videos before the batch insert, so they fail here
+        # with a clear message instead of burning a 50-unit insert each.
+        addable_ids = yt.filter_addable([video_id for _, _, video_id in pending_adds])
+        skipped_frames = []
+        for track_name, artist_name, video_id in pending_adds:
+            if video_id not in addable_ids:
+                skipped_frames.append(sse_message(f"  Skipping '{track_name} - {artist_name}' (Video ID: {video_id}): video is unavailable or private."))
+                failed_to_add_count += 1
+        if skipped_frames:
+            yield b"".join(skipped_frames)
+            pending_adds[:] = [entry for entry in pending_adds if entry[2] in addable_ids]
+            if not pending_adds:
+                return
+
         try:
-            # Defensive check for YouTube client availability
-            if not youtube_handler or not youtube_handler.youtube:
-                yield "data:   Critical Error: YouTube service became unavailable mid-process. Aborting.\n\n"
-                logger.error("YouTube service object is None before search_video_with_keywords. Aborting current conversion.")
-                break # Exit the loop if client is unavailable
-            
-            video_ids = youtube_handler.search_video_with_keywords(base_query, search_keywords, max_results=1)
+            results = yt.add_videos_to_playlist_batch(
+                youtube_playlist_id, [video_id for _, _, video_id in pending_adds])
         except googleapiclient.errors.HttpError as e:
-            error_content = str(e.content.decode() if e.content else str(e))
-            if e.resp.status == 403 and "quotaExceeded" in error_content.lower():
-                yield "data: FATAL ERROR: YouTube API Quota Exceeded during song search. Cannot continue searching. Please try again after your quota resets (usually daily PST), or request a quota increase from Google Cloud Console.\n\n"
-                logger.error("YouTube API Quota Exceeded during song search. Aborting current conversion.")
-                break # Critical error, stop processing
+            error_content = http_error_body(e)
+            if is_quota_exceeded_error(e):
+                yield sse_message("FATAL ERROR: YouTube API Quota Exceeded while trying to add videos. Cannot continue. Please try again after your quota resets.")
+                logger.error("YouTube API Quota Exceeded during batch add. Aborting current conversion.")
+                abort_conversion = True
             else:
-                yield f"data:   API Error searching for '{base_query}'. Skipping. Error: {e.resp.status} - {error_content}\n\n"
-                logger.warning(f"API Error searching for '{base_query}': {e.resp.status} - {error_content}")
-                not_found_count +=1
-                time.sleep(0.5) # Small delay before next search
-                continue
+                yield sse_message(f"  API Error adding batch of videos to playlist. Skipping batch. Error: {e.resp.status} - {error_content}")
+                logger.warning("API Error during batch add: %s - %s", e.resp.status, error_content)
+            failed_to_add_count += len(pending_adds)
+            pending_adds.clear()
+            return
         except Exception as e:
-            yield f"data:   Unexpected error searching for '{base_query}'. Skipping. Error: {str(e)}\n\n"
-            logger.exception(f"Unexpected error searching for '{base_query}': {e}")
-            not_found_count +=1
-            time.sleep(0.5) # Small delay before next search
-            continue
+            yield sse_message(f"  Unexpected error adding batch of videos to playlist. Skipping batch. Error: {str(e)}")
+            logger.exception("Unexpected error during batch add: %s", e)
+            failed_to_add_count += len(pending_adds)
+            pending_adds.clear()
+            return
 
-        if video_ids:
-            video_to_add_id = video_ids[0]
-            yield f"data:   Found YouTube video ID: {video_to_add_id}. Adding to playlist...\n\n"
-            logger.debug(f"Found video ID {video_to_add_id} for '{base_query}'. Attempting to add.")
-            try:
-                # Defensive check for YouTube client availability
-                if not youtube_handler or not youtube_handler.youtube:
-                    yield "data:   Critical Error: YouTube service became unavailable mid-process. Aborting.\n\n"
-                    logger.error("YouTube service object is None before add_video_to_playlist. Aborting current conversion.")
-                    break # Exit the loop if client is unavailable
-                
-                if youtube_handler.add_video_to_playlist(youtube_playlist_id, video_to_add_id):
-                    yield f"data:   Successfully added '{track_name} - {artist_name}' to YouTube playlist.\n\n"
-                    added_count += 1
-                else:
-                    yield f"data:   Failed to add '{track_name} - {artist_name}' (Video ID: {video_to_add_id}) to playlist. Video might be unavailable or other API issue noted in logs.\n\n"
-                    failed_to_add_count += 1
-            except googleapiclient.errors.HttpError as e:
-                error_content = str(e.content.decode() if e.content else str(e))
-                if e.resp.status == 403 and "quotaExceeded" in error_content.lower():
-                    yield "data: FATAL ERROR: YouTube API Quota Exceeded while trying to add a video. Cannot continue. Please try again after your quota resets.\n\n"
-                    logger.error("YouTube API Quota Exceeded during add_video_to_playlist. Aborting current conversion.")
-                    break # Critical error, stop processing
-                else:
-                    yield f"data:   API Error adding video '{video_to_add_id}' to playlist. Skipping. Error: {e.resp.status} - {error_content}\n\n"
-                    logger.warning(f"API Error adding video '{video_to_add_id}': {e.resp.status} - {error_content}")
-                    failed_to_add_count += 1
-            except Exception as e:
-                yield f"data:   Unexpected error adding video '{video_to_add_id}'. Skipping. Error: {str(e)}\n\n"
-                logger.exception(f"Unexpected error adding video '{video_to_add_id}': {e}")
+        # The per-video result frames are all available at once after the batch
+        # returns, so coalesce them into a single yield (one socket write)
+        # instead of up to BATCH_ADD_SIZE separate writes.
+        result_frames = []
+        for j, (track_name, artist_name, video_id) in enumerate(pending_adds):
+            if results.get(j):
+                result_frames.append(sse_message(f"  Successfully added '{track_name} - {artist_name}' to YouTube playlist."))
+                added_count += 1
+            else:
+                result_frames.append(sse_message(f"  Failed to add '{track_name} - {artist_name}' (Video ID: {video_id}) to playlist. Video might be unavailable or other API issue noted in logs."))
                 failed_to_add_count += 1
-        else:
-            yield f"data:   Could not find a suitable YouTube video for '{track_name} - {artist_name}'. Skipping.\n\n"
-            not_found_count += 1
-        
-        time.sleep(0.5) # Small delay between adding videos to avoid hitting rate limits
-
-    # Final summary messages
-    yield "\n\ndata: --- Process Complete ---\n\n"
-    yield f"data: Successfully added {added_count} songs to the YouTube playlist '{final_youtube_playlist_name}'.\n\n"
+        yield b"".join(result_frames)
+        pending_adds.clear()
+
+    # Run searches concurrently in a bounded worker pool while consuming the
+    # results strictly in playlist order, so progress messages stay readable
+    # and videos are inserted into the YouTube playlist in the original order.
+    # Batch adds happen as the buffer fills, overlapping with the searches
+    # still in flight behind them.
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SEARCHES) as executor:
+        # Playlists commonly repeat a song (e.g. the same track on multiple
+        # releases), and all searches are submitted up front — before the
+        # cache has been populated by this run — so duplicates would each
+        # burn a full 100-unit search. Submit one search per unique
+        # normalized key and let every occurrence share that future; each
+        # occurrence is still added to the playlist separately.
+        search_future_by_key = {}
+        track_search_keys = []
+        for track_name, artist_name in spotify_tracks:
+            search_key = SearchCache.make_key(track_name, artist_name)
+            track_search_keys.append(search_key)
+            if search_key not in search_future_by_key:
+                search_future_by_key[search_key] = executor.submit(search_track, track_name, artist_name)
+        if len(search_future_by_key) < total_tracks:
+            logger.info("Deduplicated %d tracks into %d unique searches.", total_tracks, len(search_future_by_key))
+
+        try:
+            for i, (track_name, artist_name) in enumerate(spotify_tracks):
+                search_future = search_future_by_key[track_search_keys[i]]
+                base_query = f"{track_name} {artist_name}"
+                yield sse_message(f"[{i+1}/{total_tracks}] Searching for: '{track_name} - {artist_name}'...")
+
+                video_ids = []
+                try:
+                    # Defensive check for YouTube client availability
+                    if yt.youtube is None:
+                        yield sse_message("  Critical Error: YouTube service became unavailable mid-process. Aborting.")
+                        logger.error("YouTube service object is None before search_video_with_keywords. Aborting current conversion.")
+                        break # Exit the loop if client is unavailable
+
+                    video_ids = search_future.result()
+                except googleapiclient.errors.HttpError as e:
+                    error_content = http_error_body(e)
+                    if is_quota_exceeded_error(e):
+                        yield sse_message("FATAL ERROR: YouTube API Quota Exceeded during song search. Cannot continue searching. Please try again after your quota resets (usually daily PST), or request a quota increase from Google Cloud Console.")
+                        logger.error("YouTube API Quota Exceeded during song search. Aborting current conversion.")
+                        abort_conversion = True # Also skip the final batch flush; inserts would hit the same dead quota
+                        break # Critical error, stop processing
+                    else:
+                        yield sse_message(f"  API Error searching for '{base_query}'. Skipping. Error: {e.resp.status} - {error_content}")
+                        logger.warning("API Error searching for '%s': %s - %s", base_query, e.resp.status, error_content)
+                        not_found_count +=1
+                        continue
+                except Exception as e:
+                    yield sse_message(f"  Unexpected error searching for '{base_query}'. Skipping. Error: {str(e)}")
+                    logger.exception("Unexpected error searching for '%s': %s", base_query, e)
+                    not_found_count +=1
+                    continue
+
+                if video_ids:
+                    video_to_add_id = video_ids[0]
+                    yield sse_message(f"  Found YouTube video ID: {video_to_add_id}. Queued for batch add.")
+                    logger.debug("Found video ID %s for '%s'. Queued for batch add.", video_to_add_id, base_query)
+                    pending_adds.append((track_name, artist_name, video_to_add_id))
+                    if len(pending_adds) >= BATCH_ADD_SIZE:
+                        yield from flush_pending_adds()
+                        if abort_conversion:
+                            break # Quota exhausted during batch add; stop processing
+                else:
+                    yield sse_message(f"  Could not find a suitable YouTube video for '{track_name} - {artist_name}'. Skipping.")
+                    not_found_count += 1
+        finally:
+            # Reached on normal completion (a no-op by then), on early breaks,
+            # and — critically — when a client disconnect closes this generator
+            # at a yield: cancel every search that has not started yet so a
+            # vanished client stops burning 100-unit quota on queued lookups,
+            # and don't block waiting for the pool here (the with-block only
+            # waits out the handful already in flight).
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Flush any videos still buffered when the loop ended (final partial batch,
+    # or videos found before an early abort).
+    if pending_adds and not abort_conversion:
+        yield from flush_pending_adds()
+
+    # Persist everything this conversion learned in one write (put/mark_miss
+    # only touch memory); an atexit hook covers abnormal shutdown.
+    search_cache.flush()
+
+    # Final summary messages, coalesced into one write since they are all
+    # known at this point and no further work separates them.
+    summary_frames = [SSE_PROCESS_COMPLETE]
+    summary_frames.append(sse_message(f"Successfully added {added_count} songs to the YouTube playlist '{final_youtube_playlist_name}'."))
     if not_found_count > 0:
-        yield f"data: {not_found_count} songs could not be found on YouTube.\n\n"
+        summary_frames.append(sse_message(f"{not_found_count} songs could not be found on YouTube."))
     if failed_to_add_count > 0:
-        yield f"data: {failed_to_add_count} songs were found but failed to be added (e.g., video unavailable, quota issue during add, or other API error).\n\n"
+        summary_frames.append(sse_message(f"{failed_to_add_count} songs were found but failed to be added (e.g., video unavailable, quota issue during add, or other API error)."))
     if youtube_playlist_id:
-        yield f"data: Find your new playlist here: https://www.youtube.com/playlist?list={youtube_playlist_id}\n\n"
-    yield "data: END_OF_STREAM\n\n" # Signal end of stream to frontend
+        summary_frames.append(sse_message(f"Find your new playlist here: https://www.youtube.com/playlist?list={youtube_playlist_id}"))
+    summary_frames.append(SSE_END_OF_STREAM) # Signal end of stream to frontend
+    yield b"".join(summary_frames)
     logger.info("Conversion process finished for this request.")
 
+def sse_response(frame_stream) -> Response:
+    """
+    Builds a streaming SSE Response with buffering disabled end to end.
+
+    direct_passthrough stops Werkzeug from copying chunks through its own
+    buffer, and the X-Accel-Buffering / Cache-Control headers tell reverse
+    proxies (nginx and friends) to forward each frame immediately instead of
+    holding it until a buffer fills — without them, progress updates can sit
+    server-side for seconds and the live stream degrades into bursts.
+    """
+    response = Response(stream_with_context(frame_stream), mimetype='text/event-stream',
+                        direct_passthrough=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Connection'] = 'keep-alive'
+    return response
+
 @app.route('/convert', methods=['POST'])
 def convert_route():
     """
@@ -273,14 +603,24 @@ def convert_route():
         logger.warning("Conversion attempt with no Spotify URL.")
         # Return an error stream if Spotify URL is missing
         def error_stream():
-            yield "data: Error: Spotify Playlist URL is required.\n\n"
-            yield "data: END_OF_STREAM\n\n"
-        return Response(stream_with_context(error_stream()), mimetype='text/event-stream')
-
-    logger.info(f"Received conversion request. Spotify URL: {spotify_playlist_url}, YT Playlist Name: '{youtube_playlist_name_input}', Privacy: {yt_privacy_status_input}")
-    # Return a streaming response using the generator function
-    return Response(stream_with_context(generate_conversion_stream(spotify_playlist_url, youtube_playlist_name_input, yt_privacy_status_input)),
-                    mimetype='text/event-stream')
+            yield sse_message("Error: Spotify Playlist URL is required.")
+            yield SSE_END_OF_STREAM
+        return sse_response(error_stream())
+
+    logger.info("Received conversion request. Spotify URL: %s, YT Playlist Name: '%s', Privacy: %s", spotify_playlist_url, youtube_playlist_name_input, yt_privacy_status_input)
+    # Return a streaming response; the conversion runs in a producer thread
+    # behind a bounded queue so a slow client applies backpressure.
+    conversion_stream = generate_conversion_stream(spotify_playlist_url, youtube_playlist_name_input, yt_privacy_status_input)
+    frames = stream_with_backpressure(conversion_stream)
+
+    # Compress the stream when the client supports it; sync-flushed gzip
+    # preserves SSE framing while cutting outbound bytes ~5-8x.
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        response = sse_response(gzip_sse_stream(frames))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    return sse_response(frames)
 
 @app.route('/check_auth')
 def check_auth_status():
@@ -290,7 +630,7 @@ def check_auth_status():
     Returns:
         dict: A JSON object with {"yt_authorized": True/False}.
     """
-    yt_authorized = os.path.exists(YT_TOKEN_FILE)
+    yt_authorized = is_youtube_authorized()
     return {"yt_authorized": yt_authorized}
 
 def attempt_open_browser():
@@ -302,12 +642,12 @@ def attempt_open_browser():
     if not _browser_opened_this_run:
         url = "http://127.0.0.1:5000/"
         try:
-            logger.info(f"Attempting to open web browser to {url}.")
+            logger.info("Attempting to open web browser to %s.", url)
             webbrowser.open_new(url)
             _browser_opened_this_run = True
         except Exception as e:
-            logger.warning(f"Could not automatically open web browser: {e}")
-            logger.warning(f"Please manually open your browser and navigate to {url}")
+            logger.warning("Could not automatically open web browser: %s", e)
+            logger.warning("Please manually open your browser and navigate to %s", url)
 
 if __name__ == '__main__':
     # Determine desired debug mode. True for development.
@@ -320,14 +660,14 @@ if __name__ == '__main__':
             os.makedirs("logs")
             logger.info("Created 'logs' directory.")
         except OSError as e:
-            logger.error(f"Could not create 'logs' directory: {e}")
+            logger.error("Could not create 'logs' directory: %s", e)
     
     if not os.path.exists("credentials"):
         try:
             os.makedirs("credentials")
             logger.info("Created 'credentials' directory. Place your 'client_secret.json' here.")
         except OSError as e:
-            logger.error(f"Could not create 'credentials' directory: {e}")
+            logger.error("Could not create 'credentials' directory: %s", e)
 
     # Check if running in Flask's reloader worker process
     is_worker_process = os.environ.get("WERKZEUG_RUN_MAIN") == "true"
@@ -339,31 +679,50 @@ if __name__ == '__main__':
             # Delay opening the browser slightly to allow the server to start
             Timer(1.0, attempt_open_browser).start()
 
-    # Conditional startup logging for cleaner console output in debug mode
+    # Conditional startup logging for cleaner console output in debug mode.
+    # The expensive client probes below run only in the worker (or the single
+    # non-debug process): the reloader parent would otherwise repeat the same
+    # network-touching constructor work on every code reload.
     if not is_worker_process and app.debug: # This is the parent reloader process
         logger.info("Flask reloader is active. Main Flask application process will start shortly.")
+        logger.info("Reloader parent: skipping client configuration probes (worker performs them).")
     else: # This is the worker process, or debug is False (single process)
         logger.info("Starting Flask application process...")
-        # Perform initial checks for client configurations
+        # Warm the module-level singletons at startup so the first conversion
+        # request does not pay the client-construction cost. YouTube auth
+        # itself stays lazy (it may need user interaction in the browser).
         try:
-            temp_spotify_handler = SpotifyClient()
-            if not temp_spotify_handler.sp:
+            spotify_handler = SpotifyClient()
+            if not spotify_handler.sp:
                 logger.warning("Spotify client failed to initialize properly on startup.")
             else:
                 logger.info("Spotify client basic initialization check passed.")
         except Exception as e:
-            logger.error(f"Failed during initial Spotify client check on startup: {e}")
+            logger.error("Failed during initial Spotify client check on startup: %s", e)
 
         try:
-            temp_yt_client = YouTubeClient()
-            if not temp_yt_client.client_secrets_file:
+            youtube_handler = YouTubeClient()
+            if not youtube_handler.client_secrets_file:
                 logger.error("YOUTUBE_CLIENT_SECRETS_FILE not set in .env.")
-            elif not os.path.exists(temp_yt_client.client_secrets_file):
-                logger.error(f"YouTube client_secret.json not found: {temp_yt_client.client_secrets_file}.")
+            elif not os.path.exists(youtube_handler.client_secrets_file):
+                logger.error("YouTube client_secret.json not found: %s.", youtube_handler.client_secrets_file)
             else:
                 logger.info("YouTube client basic configuration check passed.")
         except Exception as e:
-            logger.error(f"Problem with YouTube client configuration on startup: {e}")
-
-    # Run the Flask application
-    app.run(host='127.0.0.1', port=5000)
+            logger.error("Problem with YouTube client configuration on startup: %s", e)
+
+    # Run under a production WSGI server when available: Flask's dev server is
+    # single-threaded by default, so one SSE client would hold the only worker
+    # for its whole conversion. Waitress serves concurrent streams from a
+    # thread pool (and, unlike gunicorn, also works on Windows). Debug mode
+    # keeps the dev server for the reloader, with threading enabled.
+    if app.debug:
+        app.run(host='127.0.0.1', port=5000, threaded=True)
+    else:
+        try:
+            from waitress import serve
+            logger.info("Serving with waitress on http://127.0.0.1:5000/")
+            serve(app, host='127.0.0.1', port=5000, threads=16)
+        except ImportError:
+            logger.warning("waitress is not installed; falling back to the threaded Flask dev server.")
+            app.run(host='127.0.0.1', port=5000, threaded=True)
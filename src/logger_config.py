@@ -1,6 +1,13 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Set once by setup_logging; makes repeat calls (transient re-imports, Flask
+# reloads) a cheap no-op instead of re-touching the filesystem and starting a
+# second QueueListener thread.
+_configured_logger = None
 
 def setup_logging():
     """
@@ -9,7 +16,18 @@ def setup_logging():
     Sets up console and file handlers for the main application logger and a
     separate file handler for the Werkzeug (Flask) logger.
     Log files are stored in the 'logs' directory.
+
+    The application logger's handlers sit behind a QueueHandler/QueueListener
+    pair, so formatting and file/console I/O happen on a background thread
+    instead of blocking the request thread that emitted the record.
+
+    Idempotent: the first call configures everything and subsequent calls
+    return the already-configured logger without redoing any filesystem work.
     """
+    global _configured_logger
+    if _configured_logger is not None:
+        return _configured_logger
+
     logs_dir = "logs"
     # Create logs directory if it doesn't exist
     if not os.path.exists(logs_dir):
@@ -34,26 +52,40 @@ def setup_logging():
 
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(module)s.%(funcName)s:%(lineno)d - %(message)s')
     ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    sink_handlers = [ch]
 
     # File handler for application logs
-    if os.path.exists(logs_dir):
-        fh = RotatingFileHandler(log_file_path, maxBytes=5*1024*1024, backupCount=3)
+    logs_dir_exists = os.path.exists(logs_dir)
+    if logs_dir_exists:
+        # delay=True defers opening the file until the first record is
+        # actually written, so importing the module costs no file I/O.
+        fh = RotatingFileHandler(log_file_path, maxBytes=5*1024*1024, backupCount=3, delay=True)
         fh.setLevel(logging.DEBUG)
         fh.setFormatter(formatter)
-        logger.addHandler(fh)
-    else:
+        sink_handlers.append(fh)
+
+    # The logger itself only gets a QueueHandler (a near-instant enqueue);
+    # the listener thread drains the queue into the real console/file
+    # handlers, keeping disk and terminal latency off the hot request path.
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *sink_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop) # Flush remaining records at interpreter exit
+
+    if not logs_dir_exists:
         logger.warning(f"Log file handler not created because logs directory '{logs_dir}' does not exist.")
 
     # Configure Werkzeug logger (Flask's internal logger)
     werkzeug_logger = logging.getLogger('werkzeug')
     werkzeug_logger.setLevel(logging.INFO)
-    if os.path.exists(logs_dir):
-        werkzeug_fh = RotatingFileHandler(os.path.join(logs_dir, "werkzeug.log"), maxBytes=5*1024*1024, backupCount=2)
+    if logs_dir_exists:
+        werkzeug_fh = RotatingFileHandler(os.path.join(logs_dir, "werkzeug.log"), maxBytes=5*1024*1024, backupCount=2, delay=True)
         werkzeug_fh.setLevel(logging.INFO)
         werkzeug_fh.setFormatter(formatter)
         werkzeug_logger.addHandler(werkzeug_fh)
 
+    _configured_logger = logger
     return logger
 
 # Initialize the application logger
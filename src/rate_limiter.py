@@ -0,0 +1,71 @@
+import threading
+import time
+
+from src.logger_config import app_logger as logger
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token-bucket rate limiter for outbound API calls.
+
+    Tokens refill continuously at `max_rate` per `time_period` seconds, up to a
+    burst capacity of `max_rate` tokens. Callers acquire one token per request
+    and block only when the bucket is empty, so the limiter never adds idle
+    time while the request rate is below the configured budget (unlike a fixed
+    sleep between calls, which over-throttles fast APIs and still allows
+    bursts to collide with quota).
+
+    Usage:
+        limiter = TokenBucketRateLimiter(max_rate=5, time_period=1.0)
+        with limiter:
+            response = request.execute()
+    """
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """
+        Args:
+            max_rate (float): Number of requests allowed per time_period.
+                              Also the maximum burst size.
+            time_period (float): Length of the rate window in seconds. Defaults to 1.0.
+        """
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive.")
+        self.max_rate = float(max_rate)
+        self.time_period = float(time_period)
+        self._refill_per_second = self.max_rate / self.time_period
+        self._tokens = self.max_rate # Start with a full bucket
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available, then consumes it.
+        Returns immediately when the bucket is not empty.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # Refill tokens accrued since the last acquire, capped at burst size
+                self._tokens = min(self.max_rate, self._tokens + (now - self._last_refill) * self._refill_per_second)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Time until the next whole token accrues
+                wait_time = (1 - self._tokens) / self._refill_per_second
+            logger.debug(f"Rate limiter bucket empty; waiting {wait_time:.3f}s for next token.")
+            time.sleep(wait_time)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+if __name__ == '__main__':
+    # Quick sanity check: 20 acquires at 5/s should take roughly 3 seconds
+    # (the first 5 are served from the initial burst).
+    limiter = TokenBucketRateLimiter(max_rate=5, time_period=1.0)
+    start = time.monotonic()
+    for i in range(20):
+        with limiter:
+            print(f"Acquired token {i+1} at t={time.monotonic() - start:.2f}s")
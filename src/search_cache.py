@@ -0,0 +1,175 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.logger_config import app_logger as logger
+
+# orjson serializes/deserializes several times faster than the stdlib json
+# module; fall back transparently when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_DIR = "cache"
+CACHE_FILE = os.path.join(CACHE_DIR, "yt_search_cache.json")
+MAX_CACHE_ENTRIES = 50_000 # In-memory LRU bound; oldest entries are evicted first
+MISS_TTL_SECONDS = 7 * 24 * 3600 # How long a recorded search miss suppresses re-searching
+
+class SearchCache:
+    """
+    Persistent LRU cache of YouTube search results keyed on (track, artist).
+
+    YouTube search.list costs 100 quota units per call — the single most
+    expensive request this app makes — so tracks that repeat within a playlist,
+    across playlists, or across re-runs should only ever be searched once.
+    Only successful lookups (a found video ID) are stored.
+
+    Entries live in an in-memory OrderedDict (LRU) and are persisted to a JSON
+    file under the 'cache' directory so they survive application restarts.
+
+    Failed searches are tracked in a separate miss namespace with a TTL, so a
+    conversion retried after an abort does not re-burn quota on tracks already
+    known to be unfindable; the TTL lets them be retried eventually since new
+    uploads may appear.
+    """
+    def __init__(self, cache_file: str = CACHE_FILE, max_entries: int = MAX_CACHE_ENTRIES,
+                 miss_ttl_seconds: float = MISS_TTL_SECONDS):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.miss_ttl_seconds = miss_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._misses: dict = {} # key -> unix timestamp of the failed search
+        self._dirty = False # Unsaved changes pending a flush()
+        self._load_from_disk()
+
+    @staticmethod
+    def make_key(track_name: str, artist_name: str) -> str:
+        """
+        Builds a normalized cache key from a track and artist name.
+
+        Lowercases and collapses whitespace so trivially different spellings of
+        the same track ("Song  Name" vs "song name") hit the same entry.
+        """
+        track = " ".join(str(track_name).lower().split())
+        artist = " ".join(str(artist_name).lower().split())
+        return f"{track}|{artist}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached video ID for a key, or None on a miss.
+        A hit refreshes the entry's LRU position.
+        """
+        with self._lock:
+            video_id = self._entries.get(key)
+            if video_id is not None:
+                self._entries.move_to_end(key)
+            return video_id
+
+    def put(self, key: str, video_id: str):
+        """
+        Stores a successful search result in memory and marks the cache dirty.
+        Evicts the least-recently-used entry when the cache is full.
+        """
+        if not video_id:
+            return # Misses go through mark_miss with a TTL instead
+        with self._lock:
+            self._entries[key] = video_id
+            self._entries.move_to_end(key)
+            self._misses.pop(key, None) # A success supersedes any recorded miss
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.debug(f"Search cache full; evicted LRU entry '{evicted_key}'.")
+            self._dirty = True
+
+    def mark_miss(self, key: str):
+        """Records that a search found nothing, suppressing re-searches for the TTL."""
+        with self._lock:
+            self._misses[key] = time.time()
+            self._dirty = True
+
+    def flush(self):
+        """
+        Persists the cache to disk when it has unsaved changes.
+
+        put() and mark_miss() only mutate memory: rewriting the whole cache
+        file once per track, under the lock, from every concurrent search
+        worker would serialize the searches on disk I/O. The conversion
+        pipeline flushes once per run instead, and an atexit hook covers
+        interpreter shutdown; the cache exists to save quota, not to be
+        durable per track.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            self._save_to_disk()
+            self._dirty = False
+
+    def is_known_miss(self, key: str) -> bool:
+        """
+        Returns True when a previous search for this key found nothing within
+        the TTL window. Expired miss entries are dropped as they are seen.
+        """
+        with self._lock:
+            missed_at = self._misses.get(key)
+            if missed_at is None:
+                return False
+            if time.time() - missed_at > self.miss_ttl_seconds:
+                del self._misses[key]
+                return False
+            return True
+
+    def _load_from_disk(self):
+        """Loads previously persisted entries, ignoring a missing or corrupt file."""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            if isinstance(data, dict):
+                if "entries" in data or "misses" in data:
+                    self._entries = OrderedDict((str(k), str(v)) for k, v in data.get("entries", {}).items())
+                    self._misses = {str(k): float(v) for k, v in data.get("misses", {}).items()}
+                else:
+                    # Legacy format: a flat hit mapping with no miss namespace
+                    self._entries = OrderedDict((str(k), str(v)) for k, v in data.items())
+                logger.info(f"Loaded {len(self._entries)} cached YouTube search results "
+                            f"and {len(self._misses)} recorded misses from {self.cache_file}.")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load search cache file '{self.cache_file}': {e}. Starting with an empty cache.")
+            self._entries = OrderedDict()
+            self._misses = {}
+
+    def _save_to_disk(self):
+        """Persists the current entries to the cache file. Caller must hold the lock."""
+        try:
+            cache_dir = os.path.dirname(self.cache_file)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            payload = {"entries": dict(self._entries), "misses": self._misses}
+            with open(self.cache_file, 'wb') as f:
+                if orjson:
+                    f.write(orjson.dumps(payload))
+                else:
+                    f.write(json.dumps(payload).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not persist search cache to '{self.cache_file}': {e}")
+
+# Shared cache instance used by the conversion pipeline
+search_cache = SearchCache()
+atexit.register(search_cache.flush) # Persist any unsaved entries at shutdown
+
+if __name__ == '__main__':
+    # Quick sanity check of key normalization, hits, and persistence
+    cache = SearchCache(cache_file=os.path.join(CACHE_DIR, "yt_search_cache_test.json"), max_entries=3)
+    key = SearchCache.make_key("Bohemian  Rhapsody", "Queen")
+    print(f"Key: '{key}', miss: {cache.get(key)}")
+    cache.put(key, "fJ9rUzIMcZQ")
+    print(f"After put, hit: {cache.get(key)}")
+    print(f"Same key, different casing: {cache.get(SearchCache.make_key('bohemian rhapsody', 'QUEEN'))}")
